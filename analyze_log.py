@@ -0,0 +1,62 @@
+# analyze_log.py
+"""
+Report on a shift's telemetry log: wait times, stove utilization and why
+customers were lost.
+
+    python analyze_log.py last_shift.tlm
+    python analyze_log.py last_shift.tlm --json report.json
+
+The game logs every shift to settings.TELEMETRY_FILE; replay.py --telemetry
+writes the same log for a recorded shift.
+"""
+import argparse
+import json
+
+from systems.telemetry import load_log, analyze
+
+
+def _waits(label, stats):
+    if stats is None:
+        return f"{label:<14} -"
+    return (f"{label:<14} n={stats['count']:<5} mean {stats['mean']:6.2f}s  p50 {stats['p50']:6.2f}s  "
+            f"p90 {stats['p90']:6.2f}s  p99 {stats['p99']:6.2f}s  max {stats['max']:6.2f}s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyze a shift telemetry log")
+    parser.add_argument("log")
+    parser.add_argument("--json", metavar="FILE", help="also write the full report as JSON")
+    args = parser.parse_args(argv)
+
+    header, events = load_log(args.log)
+    report = analyze(header, events)
+
+    resumed = f" (resumed at {header['resumed_at']:.1f}s)" if header.get("resumed_at") else ""
+    print(f"{args.log}: seed {header.get('seed')}, {report['events']} events over {report['duration']:.1f}s{resumed}")
+    print(f"arrived {report['arrived']}, served {report['served']}, lost {report['lost']}, "
+          f"purchases {report['purchases']}")
+
+    print("\nWait times")
+    print(_waits("served", report["wait_served"]))
+    print(_waits("lost", report["wait_lost"]))
+    for dish, stats in report["wait_by_dish"].items():
+        print(_waits(f"  {dish}", stats))
+
+    print("\nStoves")
+    for i, used in enumerate(report["stove_utilization"]):
+        print(f"  stove {i}: {used:6.1%} busy")
+    print(f"  kitchen: {report['kitchen_utilization']:6.1%} busy, cook refused "
+          f"{report['cook_failed']['full']}x full, {report['cook_failed']['missing']}x missing ingredients")
+
+    print("\nLosses")
+    for cause, count in report["loss_causes"].items():
+        print(f"  {cause:<24} {count}")
+    print("  by dish: " + ", ".join(f"{dish} {n}" for dish, n in report["lost_by_dish"].items()))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
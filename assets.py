@@ -1,14 +1,129 @@
 # assets.py
 import pygame
 import os
+from collections import OrderedDict
 
 BASE_DIR = os.path.dirname(__file__)
 
-def load_image(relative_path):
+# (relative_path, tint, scale) -> Surface. Every sprite asking for the same
+# key gets the same Surface, so treat returned images as read-only.
+_image_cache = {}
+_cache_stats = {"hits": 0, "misses": 0}
+
+# (name, size, bold) -> Font, shared by HUD, buttons and screens
+_fonts = {}
+
+# (font, text, color, antialias) -> rendered Surface, least recently used first
+TEXT_CACHE_SIZE = 512
+_text_cache = OrderedDict()
+_text_stats = {"hits": 0, "misses": 0}
+
+
+def _decode(relative_path, tint, scale):
+    if tint is None and scale is None:
+        full_path = os.path.join(BASE_DIR, "assets", relative_path)
+        return pygame.image.load(full_path).convert_alpha()
+
+    # Variants are built from the cached plain image, not from disk again
+    image = load_image(relative_path)
+    if scale is not None:
+        image = pygame.transform.scale(image, scale)
+    else:
+        image = image.copy()
+    if tint is not None:
+        image.fill(tint, special_flags=pygame.BLEND_RGB_MULT)
+    return image
+
+
+def load_image(relative_path, tint=None, scale=None):
     """
     Loads an image from the assets folder with transparency.
     Example: load_image("images/test_sprite.png")
+
+    tint multiplies the RGB channels, scale is a (width, height) tuple.
+    Results are cached and shared, so don't draw onto them.
+    """
+    key = (relative_path, tint, scale)
+    image = _image_cache.get(key)
+    if image is None:
+        _cache_stats["misses"] += 1
+        image = _decode(relative_path, tint, scale)
+        _image_cache[key] = image
+    else:
+        _cache_stats["hits"] += 1
+    return image
+
+
+def get_font(name, size, bold=False):
+    key = (name, size, bold)
+    font = _fonts.get(key)
+    if font is None:
+        if not pygame.font.get_init():
+            # The font module starts on first use, not at import
+            pygame.font.init()
+        font = pygame.font.SysFont(name, size, bold=bold)
+        _fonts[key] = font
+    return font
+
+
+def render_text(font, text, color, antialias=True):
     """
-    full_path = os.path.join(BASE_DIR, "assets", relative_path)
-    image = pygame.image.load(full_path).convert_alpha()
-    return image
\ No newline at end of file
+    font.render() with a bounded LRU cache in front of it, so a label is
+    only rendered again when its text actually changes. Read-only result.
+    """
+    key = (font, text, color, antialias)
+    surf = _text_cache.get(key)
+    if surf is not None:
+        _text_stats["hits"] += 1
+        _text_cache.move_to_end(key)
+        return surf
+
+    _text_stats["misses"] += 1
+    surf = font.render(text, antialias, color)
+    _text_cache[key] = surf
+    if len(_text_cache) > TEXT_CACHE_SIZE:
+        _text_cache.popitem(last=False)
+    return surf
+
+
+def preload(specs):
+    """Decode a list of (relative_path, tint, scale) up front, e.g. at startup."""
+    for relative_path, tint, scale in specs:
+        load_image(relative_path, tint, scale)
+
+
+def preload_fonts(specs):
+    """Open a list of (name, size, bold) fonts up front."""
+    for name, size, bold in specs:
+        get_font(name, size, bold)
+
+
+def cache_report():
+    # Bytes are the pixel buffers the cache keeps alive
+    memory = sum(img.get_pitch() * img.get_height() for img in _image_cache.values())
+    return {
+        "entries": len(_image_cache),
+        "hits": _cache_stats["hits"],
+        "misses": _cache_stats["misses"],
+        "bytes": memory,
+        "fonts": len(_fonts),
+        "text_entries": len(_text_cache),
+        "text_hits": _text_stats["hits"],
+        "text_misses": _text_stats["misses"],
+    }
+
+
+def format_cache_report(report=None):
+    """cache_report() as one line, for the startup report, the profile dump and bench.py."""
+    r = report or cache_report()
+    return (f"images {r['entries']} ({r['hits']} hits, {r['misses']} misses, {r['bytes'] / 1024:.1f} KB), "
+            f"fonts {r['fonts']}, text {r['text_entries']} ({r['text_hits']} hits, {r['text_misses']} misses)")
+
+
+def clear_cache():
+    _image_cache.clear()
+    _cache_stats["hits"] = 0
+    _cache_stats["misses"] = 0
+    _text_cache.clear()
+    _text_stats["hits"] = 0
+    _text_stats["misses"] = 0
@@ -0,0 +1,382 @@
+# bench.py
+"""
+Benchmarks for the game's hot paths, run headless (SDL dummy video driver).
+
+    python bench.py                      # run, compare with bench_baseline.json
+    python bench.py --save               # run and make the results the new baseline
+    python bench.py --only customer --threshold 0.25
+
+Each benchmark reports the best per-call time over a few repeats. Anything
+slower than the baseline by more than --threshold (a fraction) is flagged
+and the exit status is 1, so performance work can be checked before and after.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import timeit
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from settings import WIDTH, HEIGHT, FPS, QUEUE_Y, RECIPES
+from entities.customer import Customer, CustomerPool, CUSTOMER_TINT
+from entities.player import Player
+from systems.inventory import Inventory
+from systems.kitchen import Kitchen
+from systems.simulation import Shift
+from systems.batch import BatchShift
+from systems.snapshot import snapshot, restore
+from systems.policies import batch_greedy_policy
+from ui.hud import HUD
+from ui.button import Button
+from assets import preload, get_font, format_cache_report
+import main as game  # The game's own drawing functions; importing it has no side effects
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baseline.json")
+SIZES = (10, 100, 1000)
+BENCHMARKS = []  # (name, sizes or None, setup); setup(n) returns the callable to time
+
+
+def benchmark(name, sizes=None):
+    def register(setup):
+        BENCHMARKS.append((name, sizes, setup))
+        return setup
+    return register
+
+
+# --- FIXTURES ---
+def crowded_shift(n, on_screen=None):
+    """A shift with n customers in line who never run out of patience or leave."""
+    shift = Shift(seed=0, overrides={"PATIENCE_MEAN": 1e9, "PATIENCE_STD": 0})
+    shift.max_queue = None
+    for _ in range(n):
+        shift.spawn_customer()
+    shift.next_arrival = float("inf")
+    if on_screen is not None:
+        shift.on_screen = on_screen
+    return shift
+
+
+def customer_sprites(shift):
+    return [Customer((c.x, QUEUE_Y), shift.dishes[c.order], c.max_patience)
+            for c in shift.customers.waiting(shift.on_screen)]
+
+
+def stocked_kitchen(slots):
+    inventory = Inventory()
+    for item in inventory.items:
+        inventory.items[item] = 10 ** 9
+    return Kitchen(inventory, max_slots=slots)
+
+
+def game_buttons():
+    # Same layout as the PLAYING screen in main.py
+    labels = ["Buy Rice", "Buy Egg", "Buy Veg", "Buy Chk", "Cook Rice", "Cook Chk", "Cook Omelet", "Pause"]
+    return [Button(20 + i * 95, 400, 90, 40, text, (100, 100, 200), (150, 150, 250))
+            for i, text in enumerate(labels)]
+
+
+# --- CUSTOMERS ---
+@benchmark("shift.spawn_customer")
+def bench_spawn(_):
+    shift = crowded_shift(0)
+    return shift.spawn_customer
+
+
+@benchmark("customer.sprite")
+def bench_sprite(_):
+    order = next(iter(RECIPES))
+    return lambda: Customer((100, QUEUE_Y), order, 20)
+
+
+@benchmark("customer.pool")
+def bench_pool(_):
+    # The same arrival and departure through a warm CustomerPool
+    order = next(iter(RECIPES))
+    pool = CustomerPool(1)
+    return lambda: pool.release(pool.acquire((100, QUEUE_Y), order, 20))
+
+
+@benchmark("shift.step", SIZES)
+def bench_step(n):
+    shift = crowded_shift(n)
+    return lambda: shift.step(1 / FPS)
+
+
+@benchmark("customer.sync", SIZES)
+def bench_sync(n):
+    shift = crowded_shift(n, on_screen=n)
+    sprites = list(zip(shift.customers.waiting(n), customer_sprites(shift)))
+
+    def run():
+        for record, sprite in sprites:
+            sprite.sync(record.x, shift.customers.patience(record, shift.time))
+    return run
+
+
+@benchmark("customer.draw_patience_bar", SIZES)
+def bench_patience_bar(n):
+    sprites = customer_sprites(crowded_shift(n, on_screen=n))
+    screen = pygame.display.get_surface()
+
+    def run():
+        for sprite in sprites:
+            sprite.draw_patience_bar(screen)
+    return run
+
+
+@benchmark("customer.patience_bar_blits", SIZES)
+def bench_patience_blits(n):
+    # All bars in one blits() call, as main.py draws them
+    sprites = customer_sprites(crowded_shift(n, on_screen=n))
+    screen = pygame.display.get_surface()
+    return lambda: screen.blits([sprite.patience_bar() for sprite in sprites], doreturn=False)
+
+
+@benchmark("customer.draw_order_text", SIZES)
+def bench_order_text(n):
+    sprites = customer_sprites(crowded_shift(n, on_screen=n))
+    screen = pygame.display.get_surface()
+    font = get_font("Arial", 16, bold=True)
+
+    def run():
+        for sprite in sprites:
+            sprite.draw_order_text(screen, font)
+    return run
+
+
+# --- KITCHEN ---
+@benchmark("kitchen.start_cooking", SIZES)
+def bench_start_cooking(n):
+    # Fill n stoves, then let them all finish; reported per batch
+    kitchen = stocked_kitchen(n)
+    dishes = list(RECIPES)
+
+    def run():
+        for i in range(n):
+            kitchen.start_cooking(dishes[i % len(dishes)])
+        kitchen.advance_to(kitchen.time + 1000)
+    return run
+
+
+@benchmark("kitchen.draw_progress", SIZES)
+def bench_kitchen_draw(n):
+    # n busy stoves, all on screen
+    kitchen = stocked_kitchen(n)
+    kitchen.visible_slots = lambda: n
+    for i in range(n):
+        kitchen.start_cooking(list(RECIPES)[i % len(RECIPES)])
+    kitchen.advance_to(1.0)
+    screen = pygame.display.get_surface()
+    return lambda: kitchen.draw_progress(screen)
+
+
+@benchmark("kitchen.update", SIZES)
+def bench_kitchen_update(n):
+    # n dishes on the stove that finish over the next minute
+    kitchen = stocked_kitchen(n)
+    dishes = list(RECIPES)
+    kitchen.cooking_times = {dish: 60.0 for dish in dishes}
+    for i in range(n):
+        kitchen.start_cooking(dishes[i % len(dishes)])
+        kitchen.advance_to(kitchen.time + 60.0 / n)
+
+    def run():
+        kitchen.update(1 / FPS)
+        # Keep the stoves busy: restart whatever just finished
+        while len(kitchen.tasks) < n:
+            kitchen.start_cooking(dishes[0])
+    return run
+
+
+# --- BATCHED SHIFTS ---
+@benchmark("batch.step", SIZES)
+def bench_batch_step(n):
+    # n restaurants with the vectorized greedy player, one step each
+    batch = BatchShift(n, seed=0)
+    obs = [batch.observe()]
+
+    def run():
+        obs[0] = batch.step(batch_greedy_policy(batch, obs[0]))[0]
+    return run
+
+
+# --- SNAPSHOTS ---
+def busy_shift(n):
+    # A crowded line with something on every stove
+    shift = crowded_shift(n)
+    for item in shift.inventory.items:
+        shift.inventory.items[item] = 100
+    for dish in shift.dishes * 2:
+        shift.cook(dish)
+    return shift
+
+
+@benchmark("shift.clone", SIZES)
+def bench_clone(n):
+    return busy_shift(n).clone
+
+
+@benchmark("shift.snapshot", SIZES)
+def bench_snapshot(n):
+    shift = busy_shift(n)
+    return lambda: snapshot(shift)
+
+
+@benchmark("shift.restore", SIZES)
+def bench_restore(n):
+    data = snapshot(busy_shift(n))
+    return lambda: restore(data)
+
+
+# --- UI ---
+@benchmark("hud.draw")
+def bench_hud(_):
+    hud = HUD(Inventory())
+    screen = pygame.display.get_surface()
+    return lambda: hud.draw(screen)
+
+
+@benchmark("button.draw")
+def bench_button_draw(_):
+    buttons = game_buttons()
+    screen = pygame.display.get_surface()
+
+    def run():
+        for btn in buttons:
+            btn.draw(screen)
+    return run
+
+
+@benchmark("button.check_hover")
+def bench_button_hover(_):
+    buttons = game_buttons()
+
+    def run():
+        for btn in buttons:
+            btn.check_hover((130, 420))
+    return run
+
+
+# --- FULL FRAME ---
+@benchmark("frame.playing", SIZES)
+def bench_frame(n):
+    # One PLAYING frame through main.py's own full-redraw path: step, sync
+    # sprites, static layer, draw_dynamic(), flip
+    game.screen = pygame.display.get_surface()
+    game.font = get_font("Arial", 16, bold=True)
+    game.shift = crowded_shift(n)
+    game.game_hud = HUD(game.shift.inventory)
+    game.clear_customer_sprites()
+    game.all_sprites.empty()
+    game.player = Player((WIDTH // 2, HEIGHT // 2))
+    game.all_sprites.add(game.player)
+    game.create_buttons()
+    game.GAME_STATE = "PLAYING"
+    game.game_over = False
+
+    def run():
+        game.shift.step(1 / FPS)
+        game.sync_customer_sprites()
+        game.static_layer.refresh(game.screen.get_size(), game.static_key(), game.draw_static)
+        game.screen.blit(game.static_layer.surface, (0, 0))
+        game.draw_dynamic(game.screen)
+        pygame.display.flip()
+    return run
+
+
+# --- RUNNER ---
+def measure(fn, repeat=3):
+    """Best seconds per call; autorange picks a call count that takes >= 0.2 s."""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number
+
+
+def run_benchmarks(only=None, repeat=3):
+    pygame.init()
+    pygame.display.set_mode((WIDTH, HEIGHT))
+    preload([
+        ("images/test_sprite.png", None, None),
+        ("images/test_sprite.png", CUSTOMER_TINT, None),
+    ])
+
+    for name, sizes, setup in BENCHMARKS:
+        for n in sizes or (None,):
+            label = name if n is None else f"{name}[{n}]"
+            if only and not any(part in label for part in only):
+                continue
+            seconds = measure(setup(n), repeat)
+            yield label, seconds
+
+
+def load_baseline(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)["results"]
+    except (OSError, ValueError, KeyError):
+        return {}
+
+
+def save_baseline(path, results):
+    data = {
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "machine": platform.machine(),
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+
+
+def format_time(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the game's hot paths")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--save", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="flag anything this much slower than the baseline (0.15 = 15%%)")
+    parser.add_argument("--only", action="append", metavar="TEXT",
+                        help="only run benchmarks whose name contains TEXT")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    baseline = load_baseline(args.baseline)
+    results = {}
+    regressions = []
+    for label, seconds in run_benchmarks(args.only, args.repeat):
+        results[label] = seconds
+        line = f"{label:36} {format_time(seconds):>10}"
+        old = baseline.get(label)
+        if old:
+            change = seconds / old - 1
+            line += f"  {change:+7.1%}"
+            if change > args.threshold:
+                line += "  SLOWER"
+                regressions.append(label)
+        print(line)
+    # What the benchmarks left in the image, font and text caches
+    print("asset cache:", format_cache_report())
+
+    if args.save:
+        # Keep baseline entries that were skipped with --only
+        save_baseline(args.baseline, {**baseline, **results})
+        print(f"Saved baseline to {args.baseline}")
+    if regressions:
+        print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
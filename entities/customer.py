@@ -1,60 +1,124 @@
 import pygame
-import numpy as np
-import random
-import random
-from settings import RECIPES
-from assets import load_image
-from settings import PATIENCE_MEAN, PATIENCE_STD
+from assets import load_image, render_text
+from ui.bars import bar_strip
+
+# Red-ish tint so we know it's a customer
+CUSTOMER_TINT = (200, 100, 100)
+
+# Patience bar bands: Green -> Yellow -> Red
+PATIENCE_COLORS = ((0, 255, 0), (255, 255, 0), (255, 0, 0))
 
 class Customer(pygame.sprite.Sprite):
-    def __init__(self, pos):
+    """
+    On-screen view of a customer in the Shift queue.
+    The simulation owns order/patience, this only mirrors it for drawing.
+    """
+    def __init__(self, pos, order, max_patience):
         super().__init__()
-        # Use the same test sprite for now
-        self.image = load_image("images/test_sprite.png")
-        # Tint it slightly different (Red-ish) so we know it's a customer
-        self.image.fill((200, 100, 100), special_flags=pygame.BLEND_RGB_MULT)
+        # Use the same test sprite for now, tinted and shared by every customer
+        self.image = load_image("images/test_sprite.png", tint=CUSTOMER_TINT)
         
         self.rect = self.image.get_rect(topleft=pos)
+        # Gray background and colored fill, pre-rendered for every pixel width
+        self.bar = bar_strip(self.rect.width, 5, PATIENCE_COLORS, background=(100, 100, 100))
+        self.reset(order, max_patience, pos)
 
-        # Pick a random dish from the keys of the RECIPES dictionary
-        self.order = random.choice(list(RECIPES.keys()))
-        
-        # Stats using Normal Distribution
-        self.patience = max(10, np.random.normal(PATIENCE_MEAN, PATIENCE_STD))
-        self.max_patience = self.patience
+    def reset(self, order, max_patience, pos):
+        # Start over as a new customer (CustomerPool reuses sprites)
+        self.rect.topleft = pos
+        self.order = order
+        self.patience = max_patience
+        self.max_patience = max_patience
 
-    def update(self, dt):
-        # Patience ticks down
-        self.patience -= dt
-        
-        # If patience runs out, the sprite "kills" itself (removes from all groups)
-        if self.patience <= 0:
-            self.kill()
+    def sync(self, x, patience):
+        # Copy the latest simulation state onto the sprite
+        self.rect.x = x
+        self.patience = patience
 
-    def draw_patience_bar(self, surface):
-        # Calculate ratio
-        ratio = self.patience / self.max_patience
-        
+    def bar_band(self, ratio):
         # Color transition: Green -> Yellow -> Red
         if ratio > 0.5:
-            color = (0, 255, 0) # Green
+            return 0 # Green
         elif ratio > 0.2:
-            color = (255, 255, 0) # Yellow
-        else:
-            color = (255, 0, 0) # Red
-            
-        # Draw background (gray) and foreground (colored)
-        bar_width = self.rect.width
-        bar_height = 5
-        
-        # Background rect
-        pygame.draw.rect(surface, (100, 100, 100), (self.rect.x, self.rect.y - 10, bar_width, bar_height))
-        # Filling rect
-        pygame.draw.rect(surface, color, (self.rect.x, self.rect.y - 10, bar_width * ratio, bar_height))
+            return 1 # Yellow
+        return 2 # Red
+
+    def bar_color(self, ratio):
+        return PATIENCE_COLORS[self.bar_band(ratio)]
+
+    def widgets(self, font):
+        """Sprite, bar and label as one (name, bounds, key, draw) entry."""
+        ratio = self.patience / self.max_patience
+        label = render_text(font, self.order, (255, 255, 255))
+        bounds = self.rect.union(label.get_rect(center=(self.rect.centerx, self.rect.top - 20)))
+        key = (self.rect.topleft, int(self.rect.width * ratio), self.bar_color(ratio))
+
+        def draw(surface):
+            surface.blit(self.image, self.rect)
+            self.draw_patience_bar(surface)
+            self.draw_order_text(surface, font)
+        return [(id(self), bounds, key, draw)]
+
+    def patience_bar(self):
+        """The bar as a (source, dest, area) item for surface.blits()."""
+        ratio = self.patience / self.max_patience
+        return self.bar.blit_item((self.rect.x, self.rect.y - 10), ratio, self.bar_band(ratio))
+
+    def draw_patience_bar(self, surface):
+        surface.blit(*self.patience_bar())
 
     def draw_order_text(self, surface, font):
         # Render text (Black color)
-        text_surf = font.render(self.order, True, (255, 255, 255))
+        text_surf = render_text(font, self.order, (255, 255, 255))
         # Center it above the sprite
         text_rect = text_surf.get_rect(center=(self.rect.centerx, self.rect.top - 20))
-        surface.blit(text_surf, text_rect)
\ No newline at end of file
+        surface.blit(text_surf, text_rect)
+
+class CustomerPool:
+    """
+    Customer sprites kept for reuse, so arrivals and departures don't
+    allocate: acquire() resets a free sprite for the new customer (or builds
+    one if none is free), release() takes it out of its groups and keeps it.
+
+    hits / misses count acquires served from the pool or built new, peak is
+    the most sprites out at once; stats() has them all.
+    """
+
+    def __init__(self, size=0):
+        self.free = []
+        self.in_use = 0
+        self.hits = 0
+        self.misses = 0
+        self.peak = 0
+        self.warm(size)
+
+    def warm(self, size):
+        """Build sprites up front until the pool holds size of them."""
+        while len(self.free) + self.in_use < size:
+            self.free.append(Customer((0, 0), None, 1))
+
+    def acquire(self, pos, order, max_patience):
+        if self.free:
+            customer = self.free.pop()
+            customer.reset(order, max_patience, pos)
+            self.hits += 1
+        else:
+            customer = Customer(pos, order, max_patience)
+            self.misses += 1
+        self.in_use += 1
+        self.peak = max(self.peak, self.in_use)
+        return customer
+
+    def release(self, customer):
+        customer.kill()
+        self.in_use -= 1
+        self.free.append(customer)
+
+    def stats(self):
+        return {
+            "size": len(self.free) + self.in_use,
+            "in_use": self.in_use,
+            "hits": self.hits,
+            "misses": self.misses,
+            "peak": self.peak,
+        }
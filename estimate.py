@@ -0,0 +1,106 @@
+# estimate.py
+"""
+Instant what-if answers from a queueing model instead of a simulation.
+
+    python estimate.py                                    # settings.py as it is
+    python estimate.py --set ARRIVAL_RATE=0.5 --set MAX_COOKING_SLOTS=6
+    python estimate.py --set 'COOKING_TIMES={"Omelet": 2}'
+    python estimate.py --validate --rates 0.1,0.3,0.5,0.8,1.2 --seeds 40
+
+--validate runs seeded shifts (through sweep.py's process pool) at each
+arrival rate on top of the --set values and prints the model next to the
+simulation. Validation shifts never end early: MAX_LOST is lifted so both
+sides describe a whole shift of steady play.
+"""
+import argparse
+import functools
+import json
+import time
+
+from systems.queueing import estimate
+from systems.simulation import TUNABLE_SETTINGS, shift_settings
+from systems.policies import greedy_policy
+from sweep import run_sweep
+
+# (estimate key, label, format) in print order
+REPORT = [
+    ("loss_rate", "walked out", "{:.1%}"),
+    ("turned_away_rate", "turned away", "{:.1%}"),
+    ("avg_queue", "avg line", "{:.2f}"),
+    ("utilization", "stoves busy", "{:.1%}"),
+    ("capacity_per_min", "kitchen capacity", "{:.1f}/min"),
+    ("served_per_min", "served", "{:.2f}/min"),
+    ("lost_per_min", "lost", "{:.2f}/min"),
+    ("revenue_per_min", "revenue", "${:.1f}/min"),
+    ("profit_per_min", "profit", "${:.1f}/min"),
+    ("minutes_to_game_over", "game over in", "{:.1f} min"),
+]
+# Model vs simulation columns for --validate
+COMPARED = ["loss_rate", "turned_away_rate", "avg_queue", "served_per_min", "profit_per_min"]
+
+
+def _parse_set(text):
+    name, _, value = text.partition("=")
+    if name not in TUNABLE_SETTINGS:
+        raise SystemExit(f"Unknown setting {name!r}, pick from: {', '.join(TUNABLE_SETTINGS)}")
+    return name, json.loads(value)
+
+
+def simulated(summary, duration):
+    """sweep.summarize() output in the estimate's units."""
+    minutes = duration / 60
+    return {
+        "loss_rate": summary["loss_rate"],
+        "turned_away_rate": summary["turned_away_rate"],
+        "avg_queue": summary["avg_queue_mean"],
+        "served_per_min": summary["served_mean"] / minutes,
+        "profit_per_min": (summary["money_mean"] - 100) / minutes,  # Shifts start with $100
+    }
+
+
+def validate(overrides, rates, seeds, duration, workers=None):
+    """Yields (rate, model, simulation) for each arrival rate."""
+    overrides = {**overrides, "MAX_LOST": 10 ** 9}
+    # The model assumes every stove can be cooking for someone in line
+    stoves = shift_settings(overrides)["MAX_COOKING_SLOTS"]
+    policy = functools.partial(greedy_policy, lookahead=stoves)
+    for rate in rates:
+        point = {**overrides, "ARRIVAL_RATE": rate, "ARRIVAL_PROFILE": None}
+        (_, _, summary), = run_sweep([point], seeds=seeds, duration=duration, workers=workers, policy=policy)
+        yield rate, estimate(point, duration), simulated(summary, duration)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Queueing-model estimates for the shift settings")
+    parser.add_argument("--set", action="append", default=[], metavar="NAME=VALUE",
+                        help="override a tunable setting (JSON value)")
+    parser.add_argument("--duration", type=float, default=600, help="shift length in seconds")
+    parser.add_argument("--validate", action="store_true", help="compare against seeded simulation runs")
+    parser.add_argument("--rates", default="0.1,0.3,0.5,0.8,1.2", help="arrival rates to validate at")
+    parser.add_argument("--seeds", type=int, default=40, help="shifts per rate when validating")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+    overrides = dict(map(_parse_set, args.set))
+
+    if not args.validate:
+        start = time.perf_counter()
+        result = estimate(overrides, args.duration)
+        elapsed = time.perf_counter() - start
+        for key, label, fmt in REPORT:
+            print(f"{label:<18} {fmt.format(result[key])}")
+        print(f"(estimated in {elapsed * 1000:.1f} ms)")
+        return
+
+    rates = [float(r) for r in args.rates.split(",")]
+    print(f"{'rate':>6}  " + "  ".join(f"{key:>27}" for key in COMPARED))
+    print(f"{'':>6}  " + "  ".join(f"{'model':>8} {'sim':>8} {'error':>9}" for _ in COMPARED))
+    for rate, model, sim in validate(overrides, rates, args.seeds, args.duration, args.workers):
+        cells = []
+        for key in COMPARED:
+            error = model[key] - sim[key]
+            cells.append(f"{model[key]:8.3f} {sim[key]:8.3f} {error:+9.3f}")
+        print(f"{rate:6.2f}  " + "  ".join(cells))
+
+
+if __name__ == "__main__":
+    main()
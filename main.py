@@ -1,81 +1,109 @@
+import time
+IMPORT_START = time.perf_counter()
+
 import pygame
-import numpy as np
-import sys
-import json
+import argparse
 import os
+PYGAME_IMPORTED = time.perf_counter()
 
-from settings import WIDTH, HEIGHT, FPS, ARRIVAL_RATE, INGREDIENT_PRICES, MENU_PRICES
+from settings import (WIDTH, HEIGHT, FPS, SIM_RATE, MAX_CATCHUP_STEPS, MAX_RENDER_SKIP, QUEUE_Y,
+                      DIRTY_RENDERING, PROFILE, PROFILE_FRAMES, PROFILE_CSV, REPLAY_FILE,
+                      TELEMETRY_FILE, STARTUP_BUDGET_MS, WINDOW_SIZE, SMOOTH_SCALING,
+                      SNAPSHOT_FILE, SNAPSHOT_INTERVAL)
 from entities.player import Player
-from entities.customer import Customer
-from systems.inventory import Inventory
+from entities.customer import CustomerPool, CUSTOMER_TINT
+from systems.simulation import Shift, LINE_SPOTS
+from systems.highscores import HighscoreStore
+from systems.replay import Recorder, Replayer, apply_command, load_recording, new_seed
+from systems.telemetry import Telemetry
+from systems.snapshot import save_snapshot, load_snapshot
 from ui.hud import HUD
-from systems.kitchen import Kitchen
 from ui.button import Button
-
-# --- INITIALIZATION ---
-pygame.init()
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Restaurant Game")
-clock = pygame.time.Clock()
-
-# UI Font
-font = pygame.font.SysFont("Arial", 16, bold=True)
+from ui.bars import bar_strip
+from ui.renderer import DirtyRenderer, StaticLayer
+from ui.profiler import FrameProfiler, StartupTimer
+from ui.viewport import Viewport
+from assets import preload, preload_fonts, get_font, render_text, format_cache_report
+MODULES_IMPORTED = time.perf_counter()
+
+# Importing this module only defines things; init() opens the window,
+# loads assets and reads the highscores, run() is the game loop.
+
+# --- COMMAND LINE ---
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Restaurant Game")
+    parser.add_argument("--replay", metavar="FILE", help="watch a recorded shift instead of playing")
+    parser.add_argument("--resume", action="store_true", help="continue the shift in the last snapshot")
+    parser.add_argument("--startup-report", action="store_true", help="print how long each startup phase took")
+    return parser.parse_args(argv)
+
+# Every image and font the game uses, loaded in one go by init()
+IMAGES = [
+    ("images/test_sprite.png", None, None),
+    ("images/test_sprite.png", CUSTOMER_TINT, None),
+]
+FONTS = [
+    ("Arial", 14, False), ("Arial", 14, True), ("Arial", 16, True), ("Arial", 20, True), ("Arial", 20, False),
+    ("Arial", 22, False), ("Arial", 28, True), ("Arial", 36, True), ("Arial", 40, False),
+    ("Arial", 48, True), ("Arial", 60, True),
+]
+
+# --- DISPLAY & ASSETS (set up in init()) ---
+viewport = None  # The window; the game draws into viewport.surface
+screen = None
+clock = None
+font = None  # UI Font
 
 # --- SPRITES & GROUPS ---
-player = Player((WIDTH // 2, HEIGHT // 2))
+player = None
 
 # Groups
-all_sprites = pygame.sprite.Group(player)
+all_sprites = pygame.sprite.Group()
 customers = pygame.sprite.Group()
+customer_sprites = {}  # customer uid -> Customer sprite (on-screen only)
+# Sprites are reused between customers; init() builds enough for a full line
+customer_pool = CustomerPool()
 
 # --- SYSTEMS ---
-game_inventory = Inventory()
-game_hud = HUD(game_inventory)
-game_kitchen = Kitchen(game_inventory)
+# All game logic lives in the Shift, main.py only draws it and feeds it input
+shift = None
+game_hud = None
+
+# Every shift is seeded and its commands recorded, so it can be replayed
+recorder = Recorder(None)
+replay = None  # Replayer when watching a recording (--replay)
+telemetry = None  # Event log of the shift being played
+next_snapshot = 0.0  # Shift time of the next autosave
 
 # --- GAME STATE ---
 GAME_STATE = "START"  # START, PLAYING, HELP, HIGHSCORES, PAUSED, ENTER_NAME, GAME_OVER
 pending_message = None
 message_timer = 0.0
 
-# Highscore file
-HIGHSCORE_FILE = os.path.join(os.path.dirname(__file__), "highscores.json")
-
-def load_highscores():
-    if not os.path.exists(HIGHSCORE_FILE):
-        return []
-    try:
-        with open(HIGHSCORE_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception:
-        return []
-
-def save_highscores(hs):
-    try:
-        with open(HIGHSCORE_FILE, "w", encoding="utf-8") as f:
-            json.dump(hs, f, indent=2)
-    except Exception as e:
-        print("Failed to save highscores:", e)
-
-highscores = load_highscores()
-
-def is_highscore(score):
-    hs = sorted(highscores, key=lambda x: x["score"], reverse=True)
-    if len(hs) < 5:
-        return True
-    return score > hs[-1]["score"]
+# Highscores: top 5 in memory, saved on a background thread
+highscores = None
 
 pending_score = None
 pending_name = ""
 
+# --- PLAYER COMMANDS ---
+def play(command, arg=None):
+    # Keys and buttons both act through here so the command gets recorded
+    recorder.command(command, arg, shift.time)
+    return apply_command(shift, command, arg)
+
+def pause_game(paused):
+    play("pause" if paused else "resume")
+    set_game_state('PAUSED' if paused else 'PLAYING')
+
 # --- HELPER FUNCTIONS FOR BUTTONS ---
-def buy_rice(): game_inventory.buy("Rice", INGREDIENT_PRICES["Rice"])
-def buy_egg():  game_inventory.buy("Egg", INGREDIENT_PRICES["Egg"])
-def buy_veg():  game_inventory.buy("Veggie", INGREDIENT_PRICES["Veggie"])
-def buy_chk():  game_inventory.buy("Chicken", INGREDIENT_PRICES["Chicken"])
+def buy_rice(): play("buy", "Rice")
+def buy_egg():  play("buy", "Egg")
+def buy_veg():  play("buy", "Veggie")
+def buy_chk():  play("buy", "Chicken")
 
 def cook_rice():
-    ok, info = game_kitchen.start_cooking("Fried Rice")
+    ok, info = play("cook", "Fried Rice")
     if not ok:
         global pending_message, message_timer
         if info == "full":
@@ -87,7 +115,7 @@ def cook_rice():
         message_timer = 3.0
 
 def cook_chk():
-    ok, info = game_kitchen.start_cooking("Chicken Rice")
+    ok, info = play("cook", "Chicken Rice")
     if not ok:
         global pending_message, message_timer
         if info == "full":
@@ -98,7 +126,7 @@ def cook_chk():
         message_timer = 3.0
 
 def cook_ome():
-    ok, info = game_kitchen.start_cooking("Omelet")
+    ok, info = play("cook", "Omelet")
     if not ok:
         global pending_message, message_timer
         if info == "full":
@@ -108,25 +136,7 @@ def cook_ome():
             pending_message = "Missing: " + ", ".join(parts)
         message_timer = 3.0
 
-# --- CREATE BUTTON OBJECTS ---
-buttons = []
-
-# Shop Buttons (Left side)
-buttons.append(Button(20, 400, 80, 40, "Buy Rice", (100, 100, 200), (150, 150, 250), buy_rice))
-buttons.append(Button(110, 400, 80, 40, "Buy Egg", (100, 100, 200), (150, 150, 250), buy_egg))
-buttons.append(Button(200, 400, 80, 40, "Buy Veg", (100, 100, 200), (150, 150, 250), buy_veg))
-buttons.append(Button(290, 400, 80, 40, "Buy Chk", (100, 100, 200), (150, 150, 250), buy_chk))
-
-# Cooking Buttons (Right side)
-buttons.append(Button(400, 400, 100, 40, "Cook Rice", (200, 100, 100), (250, 150, 150), cook_rice))
-buttons.append(Button(510, 400, 100, 40, "Cook Chk", (200, 100, 100), (250, 150, 150), cook_chk))
-buttons.append(Button(620, 400, 100, 40, "Cook Omelet", (200, 100, 100), (250, 150, 150), cook_ome))
-
-# Pause Button (top-right)
-pause_button = Button(WIDTH-110, 10, 100, 40, "Pause", (150,50,50), (200,80,80), lambda: set_game_state('PAUSED'))
-
-# --- START MENU BUTTONS ---
-start_buttons = []
+# --- START MENU ---
 def start_play():
     reset_game()
     set_game_state('PLAYING')
@@ -142,260 +152,301 @@ def start_highscores():
     set_game_state('HIGHSCORES')
 
 def start_exit():
-    pygame.quit()
-    sys.exit()
+    # End the loop like closing the window; main() does the cleanup
+    pygame.event.post(pygame.event.Event(pygame.QUIT))
+
+# --- BUTTONS ---
+buttons = []
+pause_button = None
+start_buttons = []
+back_button = None
+game_over_button = None
+
+def create_buttons():
+    global pause_button, back_button, game_over_button
+    buttons.clear()
+
+    # Shop Buttons (Left side)
+    buttons.append(Button(20, 400, 80, 40, "Buy Rice", (100, 100, 200), (150, 150, 250), buy_rice))
+    buttons.append(Button(110, 400, 80, 40, "Buy Egg", (100, 100, 200), (150, 150, 250), buy_egg))
+    buttons.append(Button(200, 400, 80, 40, "Buy Veg", (100, 100, 200), (150, 150, 250), buy_veg))
+    buttons.append(Button(290, 400, 80, 40, "Buy Chk", (100, 100, 200), (150, 150, 250), buy_chk))
+
+    # Cooking Buttons (Right side)
+    buttons.append(Button(400, 400, 100, 40, "Cook Rice", (200, 100, 100), (250, 150, 150), cook_rice))
+    buttons.append(Button(510, 400, 100, 40, "Cook Chk", (200, 100, 100), (250, 150, 150), cook_chk))
+    buttons.append(Button(620, 400, 100, 40, "Cook Omelet", (200, 100, 100), (250, 150, 150), cook_ome))
 
-start_buttons.append(Button(WIDTH//2 - 100, 200, 200, 50, "Play", (50,150,50), (80,200,80), start_play))
-start_buttons.append(Button(WIDTH//2 - 100, 270, 200, 50, "Help", (50,50,150), (80,80,200), start_help))
-start_buttons.append(Button(WIDTH//2 - 100, 340, 200, 50, "High Score", (150,100,50), (200,140,80), start_highscores))
-start_buttons.append(Button(WIDTH//2 - 100, 410, 200, 50, "Exit", (150,50,50), (200,80,80), start_exit))
+    # Pause Button (top-right)
+    pause_button = Button(WIDTH-110, 10, 100, 40, "Pause", (150,50,50), (200,80,80), lambda: pause_game(True))
 
-# Back button for dialogs
-back_button = Button(20, HEIGHT-60, 100, 40, "Back", (100,100,100), (150,150,150), lambda: set_game_state('START'))
+    # Start menu
+    start_buttons.clear()
+    start_buttons.append(Button(WIDTH//2 - 100, 200, 200, 50, "Play", (50,150,50), (80,200,80), start_play))
+    start_buttons.append(Button(WIDTH//2 - 100, 270, 200, 50, "Help", (50,50,150), (80,80,200), start_help))
+    start_buttons.append(Button(WIDTH//2 - 100, 340, 200, 50, "High Score", (150,100,50), (200,140,80), start_highscores))
+    start_buttons.append(Button(WIDTH//2 - 100, 410, 200, 50, "Exit", (150,50,50), (200,80,80), start_exit))
 
-# Game Over -> Main Menu button
-game_over_button = Button(WIDTH//2 - 100, HEIGHT//2 + 80, 200, 50, "Main Menu", (100,100,200), (150,150,250), lambda: set_game_state('START'))
+    # Back button for dialogs
+    back_button = Button(20, HEIGHT-60, 100, 40, "Back", (100,100,100), (150,150,150), lambda: set_game_state('START'))
 
-# --- QUEUE SYSTEM SETTINGS ---
-customer_queue = []  # Python list to track order (FIFO)
-QUEUE_START_X = 100
-QUEUE_Y = 300        # Middle of screen vertically
-SPACING = 60         # Pixels between customers
+    # Game Over -> Main Menu button
+    game_over_button = Button(WIDTH//2 - 100, HEIGHT//2 + 80, 200, 50, "Main Menu", (100,100,200), (150,150,250), lambda: set_game_state('START'))
 
 # --- GAME STATS ---
-lost_customers = 0
-MAX_LOST = 5
 game_over = False
 
-# --- POISSON ARRIVAL LOGIC ---
-def get_next_arrival_time():
-    # Exponential distribution = Poisson process for arrivals
-    return np.random.exponential(1 / ARRIVAL_RATE)
+# --- SIMULATION CLOCK ---
+# Logic runs in fixed SIM_RATE steps; frame time piles up in the accumulator
+# and the screen is drawn alpha of the way from the previous step to the last
+accumulator = 0.0
+alpha = 1.0
+render_skips = 0  # Overloaded frames in a row that weren't drawn
+
+def sim_tick():
+    # Seconds per logic step, None for one step per frame. A replay runs at
+    # the tick it was recorded with, whatever SIM_RATE is now
+    if replay is not None:
+        return replay.tick
+    return None if SIM_RATE is None else 1 / SIM_RATE
+
+def sim_step(step_dt):
+    # One logic step: the player, then the shift (live or from the replay)
+    global game_over
+    player.update(step_dt)
+    if replay is not None:
+        # The recording decides what happens and how long each step is
+        replay.step()
+        if replay.done:
+            game_over = True
+    else:
+        recorder.step(step_dt)
+        shift.step(step_dt)
+        autosave()
+
+def view_time():
+    # The shift time the screen shows
+    tick = sim_tick()
+    if tick is None:
+        return shift.time
+    return shift.time - (1 - alpha) * tick
+
+# --- RENDERING ---
+dirty_rendering = DIRTY_RENDERING
+renderer = DirtyRenderer((40, 40, 40))
+static_layer = StaticLayer()
+draw_time = 0.0    # Seconds spent drawing since the caption was last updated
+draw_frames = 0
+profiler = FrameProfiler(PROFILE_FRAMES, enabled=PROFILE)
+
+def save_profile():
+    frames = profiler.dump_csv(PROFILE_CSV)
+    print(f"Saved {frames} profiled frames to {PROFILE_CSV}")
+    print("Asset cache:", format_cache_report())
+
+def save_replay():
+    # The last shift that was played is kept for replay.py / --replay
+    # (a resumed shift has no seed to replay from)
+    if REPLAY_FILE and replay is None and recorder.seed is not None and recorder.dts:
+        recorder.save(REPLAY_FILE)
+
+def autosave():
+    # Snapshots are small and take microseconds, so the live shift is saved as it goes
+    global next_snapshot
+    if shift.game_over:
+        discard_snapshot()
+    elif SNAPSHOT_FILE and shift.time >= next_snapshot:
+        try:
+            save_snapshot(shift, SNAPSHOT_FILE)
+        except OSError as e:
+            print("Failed to save snapshot:", e)
+        next_snapshot = shift.time + SNAPSHOT_INTERVAL
+
+def discard_snapshot():
+    # A shift that ended (or was restarted) must not come back with --resume
+    global next_snapshot
+    next_snapshot = float("inf")
+    if SNAPSHOT_FILE:
+        try:
+            os.remove(SNAPSHOT_FILE)
+        except FileNotFoundError:
+            pass
+
+def close_telemetry():
+    global telemetry
+    if telemetry is not None:
+        telemetry.close(shift.time)
+        telemetry = None
+
+def watch_replay(path):
+    global shift, replay, game_over, accumulator
+    accumulator = 0.0
+    close_telemetry()
+    replay = Replayer(load_recording(path))
+    shift = replay.shift
+    game_hud.inventory = shift.inventory
+    game_over = False
+    clear_customer_sprites()
+    set_game_state('PLAYING')
 
-spawn_timer = get_next_arrival_time()
+def resume_shift(path):
+    # Pick the shift up where its last snapshot left it, paused
+    global shift, game_over, recorder, replay, accumulator, telemetry, next_snapshot
+    try:
+        resumed = load_snapshot(path)
+    except (OSError, ValueError) as e:
+        print("Nothing to resume:", e)
+        return
+    if resumed.game_over:
+        print("Nothing to resume: the last shift is over")
+        return
+    save_replay()
+    close_telemetry()
+    replay = None
+    accumulator = 0.0
+    recorder = Recorder(None)  # No seed, so it is never saved as a replay
+    shift = resumed
+    if TELEMETRY_FILE:
+        telemetry = Telemetry(TELEMETRY_FILE)
+        shift.log_to(telemetry, seed=None, overrides=shift.settings, resumed_at=shift.time)
+    next_snapshot = shift.time + SNAPSHOT_INTERVAL
+    game_hud.inventory = shift.inventory
+    game_over = False
+    clear_customer_sprites()
+    set_game_state('PAUSED')
 
-# --- GAME LOOP ---
-running = True
 def reset_game():
-    global lost_customers, game_over, customer_queue, all_sprites, customers, game_inventory, game_kitchen
-    # reset minimal state
-    lost_customers = 0
+    global shift, game_over, recorder, replay, accumulator, telemetry, next_snapshot
+    save_replay()
+    close_telemetry()
+    discard_snapshot()
+    replay = None
+    accumulator = 0.0
+    next_snapshot = 0.0
+    # a fresh shift resets inventory, kitchen, queue and stats
+    recorder = Recorder(new_seed(), tick=sim_tick())
+    telemetry = Telemetry(TELEMETRY_FILE) if TELEMETRY_FILE else None
+    shift = Shift(seed=recorder.seed, telemetry=telemetry)
+    game_hud.inventory = shift.inventory
     game_over = False
-    # remove existing customers
-    for c in customers:
-        c.kill()
-    customer_queue = []
-    # reset inventory and kitchen
-    game_inventory.items = {k:0 for k in game_inventory.items}
-    game_inventory.cooked_food = {k:0 for k in game_inventory.cooked_food}
-    game_inventory.money = 100
-    game_kitchen.slots = []
-
-
-while running:
-    dt = clock.tick(FPS) / 1000  # Delta time in seconds
-
-    # ==========================
-    # 1. INPUT HANDLING
-    # ==========================
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-
-        # global-level controls depend on GAME_STATE
-        # Only process controls for various states
-        if GAME_STATE == 'START':
-            for btn in start_buttons:
-                btn.handle_event(event)
+    clear_customer_sprites()
+
+def clear_customer_sprites():
+    # Customer uids start over with every shift, so the old sprites go back to the pool
+    for sprite in customer_sprites.values():
+        customer_pool.release(sprite)
+    customer_sprites.clear()
+
+def sync_customer_sprites():
+    # Sprites only exist for customers on screen: create them for new
+    # arrivals, drop the ones that left, move the rest (interpolated)
+    now = view_time()
+    on_screen = {c.uid: c for c in shift.customers.waiting(shift.on_screen) if c.x < WIDTH}
+    for uid in list(customer_sprites):
+        if uid not in on_screen:
+            customer_pool.release(customer_sprites.pop(uid))
+    for uid, record in on_screen.items():
+        x = record.prev_x + (record.x - record.prev_x) * alpha
+        sprite = customer_sprites.get(uid)
+        if sprite is None:
+            order = shift.dishes[record.order]
+            sprite = customer_pool.acquire((x, QUEUE_Y), order, record.max_patience)
+            customer_sprites[uid] = sprite
+            all_sprites.add(sprite)
+            customers.add(sprite)
+        sprite.sync(x, shift.customers.patience(record, now))
+
+def playing_widgets():
+    # Everything on the PLAYING screen, back to front, for the dirty renderer
+    widgets = [("player", player.rect.copy(), None, lambda s: s.blit(player.image, player.rect))]
+    for customer in customers:
+        widgets += customer.widgets(font)
+    widgets += game_hud.widgets()
+    widgets += shift.kitchen.widgets(view_time())
+
+    lives = f"Lost: {shift.lost_customers}/{shift.max_lost}"
+    lives_text = render_text(font, lives, (255, 50, 50))
+    lives_rect = lives_text.get_rect(topleft=(WIDTH//2 - 50, 20))
+    widgets.append(("lives", lives_rect, lives, lambda s: s.blit(lives_text, lives_rect)))
 
-        elif GAME_STATE == 'HELP' or GAME_STATE == 'HIGHSCORES':
-            back_button.handle_event(event)
+    if pending_message and message_timer > 0:
+        msg_surf = render_text(font, pending_message, (255, 255, 255))
+        rect = msg_surf.get_rect(center=(WIDTH//2, 80))
+        def draw_message(s):
+            pygame.draw.rect(s, (0,0,0), rect.inflate(20,10))
+            s.blit(msg_surf, rect)
+        widgets.append(("message", rect.inflate(20,10), pending_message, draw_message))
+    return widgets
+
+def draw_dynamic(surface):
+    # What changes every frame, drawn on top of the static layer
+    if GAME_STATE in ('PLAYING',):
+        # Draw Sprites
+        all_sprites.draw(surface)
+        # Every patience and stove bar in one blits() call
+        bars = [customer.patience_bar() for customer in customers]
+        bars += shift.kitchen.progress_bars(view_time())
+        surface.blits(bars, doreturn=False)
 
-        elif GAME_STATE == 'PLAYING':
-            # Handle Button Clicks
-            for btn in buttons:
-                btn.handle_event(event)
-            pause_button.handle_event(event)
-
-            # Handle Keyboard
-            if event.type == pygame.KEYDOWN:
-                # --- SHOPPING CONTROLS ---
-                if event.key == pygame.K_1:
-                    game_inventory.buy("Rice", INGREDIENT_PRICES["Rice"])
-                elif event.key == pygame.K_2:
-                    game_inventory.buy("Egg", INGREDIENT_PRICES["Egg"])
-                elif event.key == pygame.K_3:
-                    game_inventory.buy("Veggie", INGREDIENT_PRICES["Veggie"])
-                elif event.key == pygame.K_4:
-                    game_inventory.buy("Chicken", INGREDIENT_PRICES["Chicken"])
-                
-                # --- COOKING CONTROLS ---
-                elif event.key == pygame.K_r: # R for Rice (Fried Rice)
-                    game_kitchen.start_cooking("Fried Rice")
-                elif event.key == pygame.K_c: # C for Chicken Rice
-                    game_kitchen.start_cooking("Chicken Rice")
-                elif event.key == pygame.K_o: # O for Omelet
-                    game_kitchen.start_cooking("Omelet")
-                
-                # --- SERVING CONTROLS ---
-                elif event.key == pygame.K_SPACE:
-                    # 1. Check if there is anyone in line
-                    if len(customer_queue) > 0:
-                        # Get the person at the front
-                        front_customer = customer_queue[0]
-                        dish_wanted = front_customer.order
-                        
-                        # 2. Check if we have the food
-                        if game_inventory.cooked_food.get(dish_wanted, 0) > 0:
-                            # --- SUCCESSFUL SERVE ---
-                            game_inventory.cooked_food[dish_wanted] -= 1
-                            game_inventory.money += MENU_PRICES[dish_wanted]
-                            # Mark the customer as served so they don't count as "lost"
-                            front_customer.served = True
-                            front_customer.kill()
-                            print(f"Served {dish_wanted}! +${MENU_PRICES[dish_wanted]}")
-                        else:
-                            print(f"You don't have {dish_wanted}!")
-
-        elif GAME_STATE == 'PAUSED':
-            # handle pause menu clicks via mouse
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                mx, my = pygame.mouse.get_pos()
-                # Resume
-                if WIDTH//2 - 100 <= mx <= WIDTH//2 + 100 and HEIGHT//2 - 60 <= my <= HEIGHT//2 - 10:
-                    set_game_state('PLAYING')
-                # Restart
-                if WIDTH//2 - 100 <= mx <= WIDTH//2 + 100 and HEIGHT//2 - 0 <= my <= HEIGHT//2 + 50:
-                    # notify player score won't be saved
-                    print("Restarting game. Score won't be saved.")
-                    reset_game()
-                    set_game_state('PLAYING')
-                # Finish
-                if WIDTH//2 - 100 <= mx <= WIDTH//2 + 100 and HEIGHT//2 + 60 <= my <= HEIGHT//2 + 110:
-                    set_game_state('FINISH_CONFIRM')
-
-        elif GAME_STATE == 'FINISH_CONFIRM':
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                mx, my = pygame.mouse.get_pos()
-                # Yes
-                if WIDTH//2 - 100 <= mx <= WIDTH//2 - 20 and HEIGHT//2 + 40 <= my <= HEIGHT//2 + 90:
-                    # Finish game: check highscore
-                    pending_score = game_inventory.money
-                    if is_highscore(pending_score):
-                        pending_name = ""
-                        set_game_state('ENTER_NAME')
-                    else:
-                        game_over = True
-                        set_game_state('GAME_OVER')
-                # No
-                if WIDTH//2 + 20 <= mx <= WIDTH//2 + 100 and HEIGHT//2 + 40 <= my <= HEIGHT//2 + 90:
-                    set_game_state('PLAYING')
-
-        elif GAME_STATE == 'ENTER_NAME':
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_BACKSPACE:
-                    pending_name = pending_name[:-1]
-                elif event.key == pygame.K_RETURN:
-                    # Save name (max 10 chars)
-                    name = pending_name[:10] if pending_name else "Player"
-                    highscores.append({"name": name, "score": pending_score})
-                    hs_sorted = sorted(highscores, key=lambda x: x["score"], reverse=True)[:5]
-                    save_highscores(hs_sorted)
-                    # refresh
-                    highscores[:] = hs_sorted
-                    set_game_state('GAME_OVER')
-                    game_over = True
-                else:
-                    if len(pending_name) < 10 and event.unicode.isprintable():
-                        pending_name += event.unicode
+        # Draw Custom Customer UI
+        for customer in customers:
+            customer.draw_order_text(surface, font)
 
-        elif GAME_STATE == 'GAME_OVER' or game_over:
-            # handle clicks on the Main Menu button
-            game_over_button.handle_event(event)
+        # Draw UI Systems
+        game_hud.draw_lines(surface, game_hud.stock_lines())
+        game_hud.draw_lines(surface, game_hud.ready_lines())
+        # Show Lives
+        lives_text = render_text(font, f"Lost: {shift.lost_customers}/{shift.max_lost}", (255, 50, 50))
+        surface.blit(lives_text, (WIDTH//2 - 50, 20))
 
-    # Handle Button Hover (Outside event loop)
-    mouse_pos = pygame.mouse.get_pos()
-    if GAME_STATE == 'PLAYING' and not game_over:
-        for btn in buttons:
-            btn.check_hover(mouse_pos)
-        pause_button.check_hover(mouse_pos)
-    elif GAME_STATE == 'START':
-        for btn in start_buttons:
-            btn.check_hover(mouse_pos)
+    elif GAME_STATE == 'ENTER_NAME':
+        rect = pygame.Rect(WIDTH//2 - 220, HEIGHT//2 - 80, 440, 160)
+        tf = get_font("Arial", 20)
+        name_surf = render_text(tf, pending_name, (255,255,255))
+        surface.blit(name_surf, (rect.x+30, rect.y+70))
+
+    # Pending message overlay (temporary)
+    if pending_message and message_timer > 0:
+        msg_surf = render_text(font, pending_message, (255, 255, 255))
+        rect = msg_surf.get_rect(center=(WIDTH//2, 80))
+        pygame.draw.rect(surface, (0,0,0), rect.inflate(20,10))
+        surface.blit(msg_surf, rect)
+
+def static_key():
+    # Anything that changes what draw_static() would produce
+    if GAME_STATE == 'START':
+        state_key = tuple(btn.is_hovered for btn in start_buttons)
     elif GAME_STATE in ('HELP', 'HIGHSCORES'):
-        back_button.check_hover(mouse_pos)
+        state_key = (back_button.is_hovered, highscores.version)
+    elif GAME_STATE == 'PLAYING':
+        state_key = (tuple(btn.is_hovered for btn in buttons), pause_button.is_hovered, shift.kitchen.max_slots)
+    elif GAME_STATE == 'PAUSED':
+        # Nothing moves while paused
+        state_key = (id(shift), shift.time)
     elif GAME_STATE == 'GAME_OVER' or game_over:
-        game_over_button.check_hover(mouse_pos)
-
-    # ==========================
-    # 2. UPDATE LOGIC
-    # ==========================
-    
-    # Check Game Over Condition
-    if lost_customers >= MAX_LOST:
-        game_over = True
-
-    # Tick message timer
-    if message_timer > 0:
-        message_timer -= dt
-        if message_timer <= 0:
-            pending_message = None
-
-    if GAME_STATE == 'PLAYING' and not game_over:
-        # Spawning Logic (Poisson)
-        spawn_timer -= dt
-        if spawn_timer <= 0:
-            queue_pos_x = QUEUE_START_X + (len(customer_queue) * SPACING)
-            
-            # Only spawn if the line isn't going off the screen
-            if queue_pos_x < WIDTH - 50:
-                new_customer = Customer((queue_pos_x, QUEUE_Y))
-                all_sprites.add(new_customer)
-                customers.add(new_customer)
-                customer_queue.append(new_customer)
-            
-            spawn_timer = get_next_arrival_time()
-
-        # Update Systems
-        all_sprites.update(dt)
-        game_kitchen.update(dt)
-
-        # Queue Maintenance
-        survivors = [c for c in customer_queue if c.alive()]
-        # Only count customers who died from running out of patience (not served)
-        lost_this_frame = sum(1 for c in customer_queue if not c.alive() and not getattr(c, 'served', False))
-        lost_customers += lost_this_frame
-        customer_queue = survivors
-
-        # Slide Animation for Queue
-        for index, customer in enumerate(customer_queue):
-            target_x = QUEUE_START_X + (index * SPACING)
-            if customer.rect.x > target_x:
-                customer.rect.x -= 100 * dt
-                if customer.rect.x < target_x:
-                    customer.rect.x = target_x
-            else:
-                customer.rect.x = target_x
+        state_key = (game_over_button.is_hovered, shift.inventory.money)
+    else:
+        state_key = None
+    return (GAME_STATE, game_over, state_key)
 
-    # ==========================
-    # 3. DRAWING
-    # ==========================
-    screen.fill((40, 40, 40))
+def draw_static(surface):
+    # Everything on the current screen that only changes with static_key()
+    surface.fill((40, 40, 40))
 
     if GAME_STATE == 'START':
         # Title
-        title_font = pygame.font.SysFont("Arial", 48, bold=True)
-        title = title_font.render("Cafeteria Dash", True, (255, 215, 0))
-        screen.blit(title, title.get_rect(center=(WIDTH//2, 100)))
+        title_font = get_font("Arial", 48, bold=True)
+        title = render_text(title_font, "Cafeteria Dash", (255, 215, 0))
+        surface.blit(title, title.get_rect(center=(WIDTH//2, 100)))
         for btn in start_buttons:
-            btn.draw(screen)
+            btn.draw(surface)
 
     elif GAME_STATE == 'HELP':
         # Draw help dialog
         dlg_rect = pygame.Rect(80, 80, WIDTH-160, HEIGHT-160)
-        pygame.draw.rect(screen, (30,30,30), dlg_rect)
-        pygame.draw.rect(screen, (200,200,200), dlg_rect, 2)
-        help_font = pygame.font.SysFont("Arial", 20)
+        pygame.draw.rect(surface, (30,30,30), dlg_rect)
+        pygame.draw.rect(surface, (200,200,200), dlg_rect, 2)
+        help_font = get_font("Arial", 20)
         lines = [
             "Help:",
             "- Buy ingredients and cook dishes.",
@@ -404,110 +455,373 @@ while running:
         ]
         y = dlg_rect.y + 20
         for l in lines:
-            screen.blit(help_font.render(l, True, (255,255,255)), (dlg_rect.x+20, y))
+            surface.blit(render_text(help_font, l, (255,255,255)), (dlg_rect.x+20, y))
             y += 30
-        back_button.draw(screen)
+        back_button.draw(surface)
 
     elif GAME_STATE == 'HIGHSCORES':
         dlg_rect = pygame.Rect(80, 80, WIDTH-160, HEIGHT-160)
-        pygame.draw.rect(screen, (20,20,40), dlg_rect)
-        pygame.draw.rect(screen, (200,200,200), dlg_rect, 2)
-        hf = pygame.font.SysFont("Arial", 28, bold=True)
-        screen.blit(hf.render("High Scores", True, (255,215,0)), (dlg_rect.x+20, dlg_rect.y+10))
+        pygame.draw.rect(surface, (20,20,40), dlg_rect)
+        pygame.draw.rect(surface, (200,200,200), dlg_rect, 2)
+        hf = get_font("Arial", 28, bold=True)
+        surface.blit(render_text(hf, "High Scores", (255,215,0)), (dlg_rect.x+20, dlg_rect.y+10))
         y = dlg_rect.y + 60
-        entry_font = pygame.font.SysFont("Arial", 22)
-        hs_sorted = sorted(highscores, key=lambda x: x["score"], reverse=True)[:5]
-        for i, e in enumerate(hs_sorted, start=1):
-            screen.blit(entry_font.render(f"{i}. {e['name']} - ${e['score']}", True, (255,255,255)), (dlg_rect.x+40, y))
+        entry_font = get_font("Arial", 22)
+        for i, e in enumerate(highscores.top(), start=1):
+            surface.blit(render_text(entry_font, f"{i}. {e['name']} - ${e['score']}", (255,255,255)), (dlg_rect.x+40, y))
             y += 32
-        back_button.draw(screen)
+        back_button.draw(surface)
 
     elif GAME_STATE in ('PLAYING',):
-        # Draw Sprites
-        all_sprites.draw(screen)
-        # Draw Custom Customer UI
-        for customer in customers:
-            customer.draw_patience_bar(screen)
-            customer.draw_order_text(screen, font)
-
-        # Draw UI Systems
-        game_hud.draw(screen)
-        game_kitchen.draw(screen)
-        # Draw Buttons
+        # Stove outlines, fixed HUD labels and buttons
+        shift.kitchen.draw_stoves(surface)
+        game_hud.draw_lines(surface, game_hud.static_lines())
         for btn in buttons:
-            btn.draw(screen)
-        pause_button.draw(screen)
-        # Show Lives
-        lives_text = font.render(f"Lost: {lost_customers}/{MAX_LOST}", True, (255, 50, 50))
-        screen.blit(lives_text, (WIDTH//2 - 50, 20))
+            btn.draw(surface)
+        pause_button.draw(surface)
 
     elif GAME_STATE == 'PAUSED':
         # draw the paused game behind (static)
-        all_sprites.draw(screen)
-        game_hud.draw(screen)
-        game_kitchen.draw(screen)
+        all_sprites.draw(surface)
+        game_hud.draw(surface)
+        shift.kitchen.draw(surface)
         # overlay
         overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
         overlay.fill((0,0,0,150))
-        screen.blit(overlay, (0,0))
-        pf = pygame.font.SysFont("Arial", 36, bold=True)
-        screen.blit(pf.render("Paused", True, (255,255,255)), (WIDTH//2 - 60, HEIGHT//2 - 120))
+        surface.blit(overlay, (0,0))
+        pf = get_font("Arial", 36, bold=True)
+        surface.blit(render_text(pf, "Paused", (255,255,255)), (WIDTH//2 - 60, HEIGHT//2 - 120))
         # Simple buttons as rectangles
-        pygame.draw.rect(screen, (80,120,80), (WIDTH//2 - 100, HEIGHT//2 - 60, 200, 50))
-        screen.blit(font.render("Resume", True, (255,255,255)), (WIDTH//2 - 30, HEIGHT//2 - 45))
-        pygame.draw.rect(screen, (120,80,80), (WIDTH//2 - 100, HEIGHT//2 - 0, 200, 50))
-        screen.blit(font.render("Restart", True, (255,255,255)), (WIDTH//2 - 30, HEIGHT//2 + 15))
-        pygame.draw.rect(screen, (100,100,140), (WIDTH//2 - 100, HEIGHT//2 + 60, 200, 50))
-        screen.blit(font.render("Finish", True, (255,255,255)), (WIDTH//2 - 30, HEIGHT//2 + 75))
+        pygame.draw.rect(surface, (80,120,80), (WIDTH//2 - 100, HEIGHT//2 - 60, 200, 50))
+        surface.blit(render_text(font, "Resume", (255,255,255)), (WIDTH//2 - 30, HEIGHT//2 - 45))
+        pygame.draw.rect(surface, (120,80,80), (WIDTH//2 - 100, HEIGHT//2 - 0, 200, 50))
+        surface.blit(render_text(font, "Restart", (255,255,255)), (WIDTH//2 - 30, HEIGHT//2 + 15))
+        pygame.draw.rect(surface, (100,100,140), (WIDTH//2 - 100, HEIGHT//2 + 60, 200, 50))
+        surface.blit(render_text(font, "Finish", (255,255,255)), (WIDTH//2 - 30, HEIGHT//2 + 75))
 
     elif GAME_STATE == 'FINISH_CONFIRM':
         # Confirmation dialog
         rect = pygame.Rect(WIDTH//2 - 180, HEIGHT//2 - 80, 360, 200)
-        pygame.draw.rect(screen, (30,30,30), rect)
-        pygame.draw.rect(screen, (200,200,200), rect, 2)
-        tf = pygame.font.SysFont("Arial", 22)
-        screen.blit(tf.render("Are you sure you want to finish?", True, (255,255,255)), (rect.x+20, rect.y+30))
+        pygame.draw.rect(surface, (30,30,30), rect)
+        pygame.draw.rect(surface, (200,200,200), rect, 2)
+        tf = get_font("Arial", 22)
+        surface.blit(render_text(tf, "Are you sure you want to finish?", (255,255,255)), (rect.x+20, rect.y+30))
         # Yes / No buttons
-        pygame.draw.rect(screen, (80,120,80), (WIDTH//2 - 100, HEIGHT//2 + 40, 80, 50))
-        screen.blit(font.render("Yes", True, (255,255,255)), (WIDTH//2 - 70, HEIGHT//2 + 55))
-        pygame.draw.rect(screen, (120,80,80), (WIDTH//2 + 20, HEIGHT//2 + 40, 80, 50))
-        screen.blit(font.render("No", True, (255,255,255)), (WIDTH//2 + 45, HEIGHT//2 + 55))
+        pygame.draw.rect(surface, (80,120,80), (WIDTH//2 - 100, HEIGHT//2 + 40, 80, 50))
+        surface.blit(render_text(font, "Yes", (255,255,255)), (WIDTH//2 - 70, HEIGHT//2 + 55))
+        pygame.draw.rect(surface, (120,80,80), (WIDTH//2 + 20, HEIGHT//2 + 40, 80, 50))
+        surface.blit(render_text(font, "No", (255,255,255)), (WIDTH//2 + 45, HEIGHT//2 + 55))
 
     elif GAME_STATE == 'ENTER_NAME':
-        # Prompt for name
+        # Prompt for name (the name itself is drawn every frame)
         rect = pygame.Rect(WIDTH//2 - 220, HEIGHT//2 - 80, 440, 160)
-        pygame.draw.rect(screen, (25,25,40), rect)
-        pygame.draw.rect(screen, (200,200,200), rect, 2)
-        tf = pygame.font.SysFont("Arial", 20)
-        screen.blit(tf.render(f"You made the High Scores! Enter name (max 10):", True, (255,255,255)), (rect.x+20, rect.y+20))
-        pygame.draw.rect(screen, (255,255,255), (rect.x+20, rect.y+60, 400, 40), 2)
-        name_surf = tf.render(pending_name, True, (255,255,255))
-        screen.blit(name_surf, (rect.x+30, rect.y+70))
+        pygame.draw.rect(surface, (25,25,40), rect)
+        pygame.draw.rect(surface, (200,200,200), rect, 2)
+        tf = get_font("Arial", 20)
+        surface.blit(render_text(tf, f"You made the High Scores! Enter name (max 10):", (255,255,255)), (rect.x+20, rect.y+20))
+        pygame.draw.rect(surface, (255,255,255), (rect.x+20, rect.y+60, 400, 40), 2)
 
     elif GAME_STATE == 'GAME_OVER' or game_over:
         # --- GAME OVER SCREEN ---
-        screen.fill((0, 0, 0)) # Black background
+        surface.fill((0, 0, 0)) # Black background
         # "GAME OVER" Text
-        go_font = pygame.font.SysFont("Arial", 60, bold=True)
-        text = go_font.render("GAME OVER", True, (255, 0, 0))
+        go_font = get_font("Arial", 60, bold=True)
+        text = render_text(go_font, "GAME OVER", (255, 0, 0))
         text_rect = text.get_rect(center=(WIDTH//2, HEIGHT//2 - 50))
-        screen.blit(text, text_rect)
+        surface.blit(text, text_rect)
         # Score Text
-        score_font = pygame.font.SysFont("Arial", 40)
-        score_text = score_font.render(f"Final Money: ${game_inventory.money}", True, (255, 255, 255))
+        score_font = get_font("Arial", 40)
+        score_text = render_text(score_font, f"Final Money: ${shift.inventory.money}", (255, 255, 255))
         score_rect = score_text.get_rect(center=(WIDTH//2, HEIGHT//2 + 20))
-        screen.blit(score_text, score_rect)
+        surface.blit(score_text, score_rect)
         # Main Menu button
-        game_over_button.draw(screen)
+        game_over_button.draw(surface)
+
+
+# --- STARTUP ---
+def init(args, timer):
+    # Everything with a side effect happens here, one measured phase each
+    global viewport, screen, clock, font, player, shift, game_hud, highscores
+
+    with timer.phase("display"):
+        # Only the subsystems the game uses; fonts start with preload_fonts()
+        pygame.display.init()
+        viewport = Viewport((WIDTH, HEIGHT), WINDOW_SIZE, smooth=SMOOTH_SCALING)
+        screen = viewport.surface
+        pygame.display.set_caption("Restaurant Game")
+        clock = pygame.time.Clock()
+
+    with timer.phase("assets"):
+        # Decode every image and open every font once here instead of on first use
+        preload(IMAGES)
+        preload_fonts(FONTS)
+        font = get_font("Arial", 16, bold=True)
+        bar_strip(70, 50, [(0, 255, 0)])  # Stove bars
+
+    with timer.phase("ui"):
+        player = Player((WIDTH // 2, HEIGHT // 2))
+        all_sprites.add(player)
+        customer_pool.warm(LINE_SPOTS)
+        create_buttons()
+
+    with timer.phase("highscores"):
+        highscores = HighscoreStore(os.path.join(os.path.dirname(__file__), "highscores.json"))
+
+    with timer.phase("shift"):
+        shift = Shift()
+        game_hud = HUD(shift.inventory)
+        if args.replay:
+            watch_replay(args.replay)
+        elif args.resume:
+            resume_shift(SNAPSHOT_FILE)
+
+def shutdown():
+    save_replay()
+    close_telemetry()
+    if profiler.count:
+        save_profile()
+    highscores.close()
+    pygame.quit()
 
-    # Pending message overlay (temporary)
-    if pending_message and message_timer > 0:
-        msg_surf = font.render(pending_message, True, (255, 255, 255))
-        rect = msg_surf.get_rect(center=(WIDTH//2, 80))
-        pygame.draw.rect(screen, (0,0,0), rect.inflate(20,10))
-        screen.blit(msg_surf, rect)
+# --- GAME LOOP ---
+def run():
+    global game_over, pending_message, message_timer, pending_name, pending_score
+    global accumulator, alpha, render_skips, dirty_rendering, draw_time, draw_frames
+    running = True
+
+    while running:
+        dt = clock.tick(FPS) / 1000  # Delta time in seconds
+        profiler.begin_frame()
+
+        # ==========================
+        # 1. INPUT HANDLING
+        # ==========================
+        for event in pygame.event.get():
+            event = viewport.map_event(event)  # Mouse positions in game pixels
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.VIDEORESIZE:
+                viewport.resize()
+                renderer.invalidate()
+
+            # --- RENDER MODE & PROFILER (any screen) ---
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F2:
+                # Compare frame times between dirty rects and full redraw
+                dirty_rendering = not dirty_rendering
+                renderer.invalidate()
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                profiler.toggle()
+                renderer.invalidate()
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+                save_profile()
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F5:
+                viewport.toggle_smooth()
+
+            # global-level controls depend on GAME_STATE
+            # Only process controls for various states
+            if GAME_STATE == 'START':
+                for btn in start_buttons:
+                    btn.handle_event(event)
+
+            elif GAME_STATE == 'HELP' or GAME_STATE == 'HIGHSCORES':
+                back_button.handle_event(event)
+
+            elif GAME_STATE == 'PLAYING' and replay is not None:
+                # Watching a replay: the recording plays, input is ignored
+                pass
+
+            elif GAME_STATE == 'PLAYING':
+                # Handle Button Clicks
+                for btn in buttons:
+                    btn.handle_event(event)
+                pause_button.handle_event(event)
+
+                # Handle Keyboard
+                if event.type == pygame.KEYDOWN:
+                    # --- SHOPPING CONTROLS ---
+                    if event.key == pygame.K_1:
+                        play("buy", "Rice")
+                    elif event.key == pygame.K_2:
+                        play("buy", "Egg")
+                    elif event.key == pygame.K_3:
+                        play("buy", "Veggie")
+                    elif event.key == pygame.K_4:
+                        play("buy", "Chicken")
+
+                    # --- COOKING CONTROLS ---
+                    elif event.key == pygame.K_r: # R for Rice (Fried Rice)
+                        play("cook", "Fried Rice")
+                    elif event.key == pygame.K_c: # C for Chicken Rice
+                        play("cook", "Chicken Rice")
+                    elif event.key == pygame.K_o: # O for Omelet
+                        play("cook", "Omelet")
+
+                    # --- SERVING CONTROLS ---
+                    elif event.key == pygame.K_SPACE:
+                        # Served dishes show up in the telemetry log
+                        play("serve")
+
+            elif GAME_STATE == 'PAUSED':
+                # handle pause menu clicks via mouse
+                if event.type == pygame.MOUSEBUTTONDOWN:
+                    mx, my = event.pos
+                    # Resume
+                    if WIDTH//2 - 100 <= mx <= WIDTH//2 + 100 and HEIGHT//2 - 60 <= my <= HEIGHT//2 - 10:
+                        pause_game(False)
+                    # Restart
+                    if WIDTH//2 - 100 <= mx <= WIDTH//2 + 100 and HEIGHT//2 - 0 <= my <= HEIGHT//2 + 50:
+                        # notify player score won't be saved
+                        print("Restarting game. Score won't be saved.")
+                        reset_game()
+                        set_game_state('PLAYING')
+                    # Finish
+                    if WIDTH//2 - 100 <= mx <= WIDTH//2 + 100 and HEIGHT//2 + 60 <= my <= HEIGHT//2 + 110:
+                        set_game_state('FINISH_CONFIRM')
+
+            elif GAME_STATE == 'FINISH_CONFIRM':
+                if event.type == pygame.MOUSEBUTTONDOWN:
+                    mx, my = event.pos
+                    # Yes
+                    if WIDTH//2 - 100 <= mx <= WIDTH//2 - 20 and HEIGHT//2 + 40 <= my <= HEIGHT//2 + 90:
+                        # Finish game: check highscore
+                        discard_snapshot()
+                        pending_score = shift.inventory.money
+                        if highscores.is_highscore(pending_score):
+                            pending_name = ""
+                            set_game_state('ENTER_NAME')
+                        else:
+                            game_over = True
+                            set_game_state('GAME_OVER')
+                    # No
+                    if WIDTH//2 + 20 <= mx <= WIDTH//2 + 100 and HEIGHT//2 + 40 <= my <= HEIGHT//2 + 90:
+                        pause_game(False)
+
+            elif GAME_STATE == 'ENTER_NAME':
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_BACKSPACE:
+                        pending_name = pending_name[:-1]
+                    elif event.key == pygame.K_RETURN:
+                        # Save name (max 10 chars)
+                        name = pending_name[:10] if pending_name else "Player"
+                        highscores.add(name, pending_score)
+                        set_game_state('GAME_OVER')
+                        game_over = True
+                    else:
+                        if len(pending_name) < 10 and event.unicode.isprintable():
+                            pending_name += event.unicode
+
+            elif GAME_STATE == 'GAME_OVER' or game_over:
+                # handle clicks on the Main Menu button
+                game_over_button.handle_event(event)
+
+        profiler.mark("events")
+
+        # Handle Button Hover (Outside event loop)
+        mouse_pos = viewport.mouse_pos()
+        if GAME_STATE == 'PLAYING' and not game_over:
+            for btn in buttons:
+                btn.check_hover(mouse_pos)
+            pause_button.check_hover(mouse_pos)
+        elif GAME_STATE == 'START':
+            for btn in start_buttons:
+                btn.check_hover(mouse_pos)
+        elif GAME_STATE in ('HELP', 'HIGHSCORES'):
+            back_button.check_hover(mouse_pos)
+        elif GAME_STATE == 'GAME_OVER' or game_over:
+            game_over_button.check_hover(mouse_pos)
+        profiler.mark("hover")
+
+        # ==========================
+        # 2. UPDATE LOGIC
+        # ==========================
+
+        # Check Game Over Condition
+        if shift.game_over:
+            game_over = True
+
+        # Tick message timer
+        if message_timer > 0:
+            message_timer -= dt
+            if message_timer <= 0:
+                pending_message = None
+
+        steps = 0
+        if GAME_STATE == 'PLAYING' and not game_over:
+            # Update Systems
+            tick = sim_tick()
+            if tick is None:
+                # One step per frame, as long as the frame took
+                sim_step(dt)
+            else:
+                accumulator += dt
+                while accumulator >= tick and steps < MAX_CATCHUP_STEPS and not game_over:
+                    sim_step(tick)
+                    accumulator -= tick
+                    steps += 1
+                if accumulator >= tick:
+                    # Too far behind to catch up: drop the backlog, the game slows down for a moment
+                    accumulator = 0.0
+                alpha = accumulator / tick
+        sync_customer_sprites()
+        profiler.mark("update")
+
+        # Skip drawing a frame or two when the machine can't keep up, so the
+        # logic gets the time instead
+        if steps > 1 and dt > 2 / FPS and render_skips < MAX_RENDER_SKIP:
+            render_skips += 1
+            profiler.end_frame(len(shift.customers), len(shift.kitchen.tasks), customer_pool.stats())
+            continue
+        render_skips = 0
+
+        # ==========================
+        # 3. DRAWING
+        # ==========================
+        draw_start = time.perf_counter()
+        use_dirty = dirty_rendering and GAME_STATE == 'PLAYING' and not game_over
+
+        # Static content is baked once per state/hover change and reused
+        if static_layer.refresh(screen.get_size(), static_key(), draw_static):
+            renderer.invalidate()
+
+        if use_dirty:
+            # Only widgets that changed are redrawn and sent to the display
+            widgets = playing_widgets() + profiler.widgets(screen, 1000 / FPS)
+            dirty_rects = renderer.render(screen, widgets, static_layer.surface)
+        else:
+            renderer.invalidate()
+            screen.blit(static_layer.surface, (0, 0))
+            draw_dynamic(screen)
+            profiler.draw(screen, 1000 / FPS)
+        profiler.mark("draw")
+
+        # One blit or scale into the window; full redraws send the whole window
+        viewport.present(dirty_rects if use_dirty else None)
+        profiler.mark("flip")
+        profiler.end_frame(len(shift.customers), len(shift.kitchen.tasks), customer_pool.stats())
+
+        # Average draw time per frame in the caption, to compare render modes
+        draw_time += time.perf_counter() - draw_start
+        draw_frames += 1
+        if draw_frames == FPS:
+            mode = "dirty" if dirty_rendering else "full"
+            pygame.display.set_caption(f"Restaurant Game [{mode}] draw {draw_time / draw_frames * 1000:.2f} ms")
+            draw_time = 0.0
+            draw_frames = 0
+
+def main(argv=None):
+    timer = StartupTimer()
+    timer.add("pygame", PYGAME_IMPORTED - IMPORT_START)
+    timer.add("game modules", MODULES_IMPORTED - PYGAME_IMPORTED)
+    args = parse_args(argv)
+    init(args, timer)
+    if args.startup_report or timer.total() > STARTUP_BUDGET_MS:
+        print(timer.report(STARTUP_BUDGET_MS))
+        print("Asset cache:", format_cache_report())
+    try:
+        run()
+    finally:
+        shutdown()
 
-    # Flip happens every frame regardless of state
-    pygame.display.flip()
 
-pygame.quit()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# replay.py
+"""
+Replay a recorded shift without a display, as a reproducible workload.
+
+    python replay.py last_replay.json              # as fast as possible
+    python replay.py last_replay.json --paced      # at the speed it was played
+    python replay.py last_replay.json --repeat 50  # load test: timing over 50 runs
+    python replay.py last_replay.json --cprofile replay.prof
+    python replay.py last_replay.json --telemetry shift.tlm  # event log for analyze_log.py
+
+    python main.py --replay last_replay.json       # watch it in the game window
+
+The game writes every shift to settings.REPLAY_FILE. A replay rebuilds
+the Shift from the recorded seed and feeds it the same commands and
+frame times, so every run ends with exactly the same results.
+"""
+import argparse
+import cProfile
+import statistics
+import sys
+import time
+
+from systems.replay import load_recording, recording_steps, run_replay
+from systems.telemetry import Telemetry
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a recorded shift headless")
+    parser.add_argument("recording")
+    parser.add_argument("--paced", action="store_true", help="keep the recorded frame timing")
+    parser.add_argument("--repeat", type=int, default=1, help="run the replay N times and report timings")
+    parser.add_argument("--cprofile", metavar="FILE", help="write cProfile stats for the runs to FILE")
+    parser.add_argument("--telemetry", metavar="FILE", help="write the event log of the (last) run to FILE")
+    args = parser.parse_args(argv)
+
+    recording = load_recording(args.recording)
+    steps = recording_steps(recording)
+    profiler = cProfile.Profile() if args.cprofile else None
+
+    timings = []
+    results = None
+    for i in range(args.repeat):
+        # Only the last run is logged, the others are timed without it
+        telemetry = Telemetry(args.telemetry) if args.telemetry and i == args.repeat - 1 else None
+        start = time.perf_counter()
+        if profiler:
+            profiler.enable()
+        run_results = run_replay(recording, paced=args.paced, telemetry=telemetry)
+        if profiler:
+            profiler.disable()
+        timings.append(time.perf_counter() - start)
+        if telemetry:
+            telemetry.close(run_results["time"])
+        if results is not None and run_results != results:
+            raise SystemExit("Replay diverged between runs; the shift is not deterministic")
+        results = run_results
+
+    print(f"{steps} steps, {len(recording['commands'])} commands, seed {recording['seed']}")
+    print("results:", results)
+    best = min(timings)
+    print(f"{len(timings)} run(s): best {best * 1000:.2f} ms, median {statistics.median(timings) * 1000:.2f} ms, "
+          f"{steps / best:,.0f} steps/s")
+    if profiler:
+        profiler.dump_stats(args.cprofile)
+        print(f"cProfile stats written to {args.cprofile}")
+    if args.telemetry:
+        print(f"Event log written to {args.telemetry}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
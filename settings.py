@@ -1,9 +1,22 @@
 # settings.py
-import numpy as np
 # Screen
 WIDTH = 800
 HEIGHT = 600
-FPS = 60
+WINDOW_SIZE = (WIDTH, HEIGHT)  # Initial window; the game is drawn at WIDTH x HEIGHT and scaled to fit
+SMOOTH_SCALING = False   # F5 toggles between nearest (fast) and smooth scaling
+FPS = 60                 # Render rate cap
+SIM_RATE = 60            # Fixed logic steps per second (None: one step per frame with the frame's dt)
+MAX_CATCHUP_STEPS = 5    # Logic steps per frame at most; past that the game slows down instead
+MAX_RENDER_SKIP = 2      # Overloaded frames in a row that may skip drawing
+DIRTY_RENDERING = False  # F2 toggles between dirty rects and full redraw
+PROFILE = False          # F3 toggles the frame profiler overlay, F4 saves it
+PROFILE_FRAMES = 600     # Frames kept by the profiler
+PROFILE_CSV = "profile.csv"
+REPLAY_FILE = "last_replay.json"  # Every shift is recorded here (None to turn it off)
+TELEMETRY_FILE = "last_shift.tlm"  # Event log of the last shift, for analyze_log.py (None to turn it off)
+SNAPSHOT_FILE = "autosave.snap"    # Live shift saved here for --resume (None to turn it off)
+SNAPSHOT_INTERVAL = 5.0            # Shift seconds between snapshots
+STARTUP_BUDGET_MS = 1000  # Cold start (imports + init) over this prints the startup report
 
 # Colors
 WHITE = (255, 255, 255)
@@ -19,8 +32,21 @@ MAX_COOKING_SLOTS = 4
 
 # Customer Settings
 ARRIVAL_RATE = 0.1  # Average customers per second (λ)
+# Optional rate over the shift instead, e.g. a lunch rush:
+# [(0, 0.1), (60, 0.1), (120, 0.3), (180, 0.1)]  (seconds, customers per second)
+ARRIVAL_PROFILE = None
 PATIENCE_MEAN = 20  # Average patience in seconds
 PATIENCE_STD = 5    # Standard deviation
+MIN_PATIENCE = 10   # Nobody waits less than this
+
+# Queue layout (also limits how many people fit in line)
+QUEUE_START_X = 100
+QUEUE_Y = 300        # Middle of screen vertically
+SPACING = 60         # Pixels between customers
+SLIDE_SPEED = 100    # Pixels per second when the line moves up
+
+# Lose condition
+MAX_LOST = 5
 
 # settings.py
 
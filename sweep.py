@@ -0,0 +1,175 @@
+# sweep.py
+"""
+Monte Carlo parameter sweep over settings.py, run headless across all cores.
+
+    python sweep.py --grid ARRIVAL_RATE=0.1,0.2,0.3 --grid MAX_COOKING_SLOTS=2,4 --seeds 200
+    python sweep.py --random 50 --range PATIENCE_MEAN=10:30 --range ARRIVAL_RATE=0.05:0.3
+    python sweep.py --grid 'COOKING_TIMES=[{"Omelet": 2}, {"Omelet": 4}]' --out omelet.csv
+
+Every point runs the same seeds (base_seed + i), so differences between
+points come from the settings and not from luck. Overrides are passed to
+each Shift, the settings module itself is never touched. One CSV row per
+point is written as soon as all of its shifts are done.
+"""
+import argparse
+import csv
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from systems.simulation import Shift, TUNABLE_SETTINGS
+from systems.policies import greedy_policy
+
+METRICS = [
+    "shifts", "money_mean", "money_p10", "money_p50", "money_p90",
+    "served_mean", "loss_rate", "turned_away_rate", "avg_queue_mean",
+    "game_over_rate",
+]
+
+
+# --- POINTS ---
+def grid_points(grid):
+    """{"NAME": [values]} -> list of override dicts, one per combination."""
+    names = list(grid)
+    return [dict(zip(names, combo)) for combo in itertools.product(*grid.values())]
+
+
+def random_points(ranges, n, seed=0):
+    """{"NAME": (low, high)} -> n override dicts sampled uniformly."""
+    rng = np.random.default_rng(seed)
+    points = []
+    for _ in range(n):
+        point = {}
+        for name, (low, high) in ranges.items():
+            if isinstance(low, int) and isinstance(high, int):
+                point[name] = int(rng.integers(low, high + 1))
+            else:
+                point[name] = float(rng.uniform(low, high))
+        points.append(point)
+    return points
+
+
+# --- WORKERS ---
+def run_batch(overrides, seeds, duration, mode="events", policy=greedy_policy):
+    """Run one headless shift per seed and return their results."""
+    results = []
+    for seed in seeds:
+        shift = Shift(seed=seed, overrides=overrides)
+        if mode == "events":
+            results.append(shift.run_events(duration, policy=policy))
+        else:
+            results.append(shift.run(duration, policy=policy))
+    return results
+
+
+def summarize(results):
+    money = np.array([r["money"] for r in results], dtype=float)
+    arrived = sum(r["arrived"] for r in results)
+    offered = arrived + sum(r["turned_away"] for r in results)
+    p10, p50, p90 = np.percentile(money, [10, 50, 90])
+    return {
+        "shifts": len(results),
+        "money_mean": money.mean(),
+        "money_p10": p10,
+        "money_p50": p50,
+        "money_p90": p90,
+        "served_mean": np.mean([r["served"] for r in results]),
+        "loss_rate": sum(r["lost"] for r in results) / arrived if arrived else 0.0,
+        "turned_away_rate": sum(r["turned_away"] for r in results) / offered if offered else 0.0,
+        "avg_queue_mean": np.mean([r["avg_queue"] for r in results]),
+        "game_over_rate": np.mean([r["game_over"] for r in results]),
+    }
+
+
+def run_sweep(points, seeds=100, duration=600, base_seed=0, mode="events",
+              workers=None, chunk=25, policy=greedy_policy):
+    """
+    Yields (point_index, overrides, summary) as points finish, in whatever
+    order the process pool completes them.
+    """
+    seed_list = [base_seed + i for i in range(seeds)]
+    chunks = [seed_list[i:i + chunk] for i in range(0, seeds, chunk)]
+
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        futures = {}
+        for index, overrides in enumerate(points):
+            for seed_chunk in chunks:
+                future = pool.submit(run_batch, overrides, seed_chunk, duration, mode, policy)
+                futures[future] = index
+
+        pending = {index: len(chunks) for index in range(len(points))}
+        collected = {index: [] for index in range(len(points))}
+        for future in as_completed(futures):
+            index = futures[future]
+            collected[index].extend(future.result())
+            pending[index] -= 1
+            if pending[index] == 0:
+                yield index, points[index], summarize(collected.pop(index))
+
+
+def write_csv(path, points, rows):
+    """Stream sweep rows into a CSV, one column per swept setting plus METRICS."""
+    names = sorted({name for point in points for name in point})
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["point"] + names + METRICS)
+        for index, overrides, summary in rows:
+            values = [json.dumps(overrides[n]) if isinstance(overrides.get(n), (dict, list))
+                      else overrides.get(n, "") for n in names]
+            writer.writerow([index] + values + [summary[m] for m in METRICS])
+            f.flush()
+            yield index, overrides, summary
+
+
+# --- CLI ---
+def _parse_values(text):
+    if text.lstrip().startswith("["):
+        return json.loads(text)
+    return [json.loads(v) for v in text.split(",")]
+
+
+def _parse_assignment(text):
+    name, _, value = text.partition("=")
+    if name not in TUNABLE_SETTINGS:
+        raise SystemExit(f"Unknown setting {name!r}, pick from: {', '.join(TUNABLE_SETTINGS)}")
+    return name, value
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parallel Monte Carlo sweep over settings.py")
+    parser.add_argument("--grid", action="append", default=[], metavar="NAME=V1,V2",
+                        help="values for one setting (comma list or JSON list)")
+    parser.add_argument("--range", action="append", default=[], metavar="NAME=LOW:HIGH",
+                        help="uniform range for --random sampling")
+    parser.add_argument("--random", type=int, default=0, metavar="N",
+                        help="sample N random points from the --range settings")
+    parser.add_argument("--seeds", type=int, default=100, help="shifts per point")
+    parser.add_argument("--base-seed", type=int, default=0)
+    parser.add_argument("--duration", type=float, default=600, help="seconds per shift")
+    parser.add_argument("--mode", choices=("events", "frames"), default="events")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--out", default="sweep.csv")
+    args = parser.parse_args(argv)
+
+    grid = dict((name, _parse_values(value)) for name, value in map(_parse_assignment, args.grid))
+    points = grid_points(grid)
+    if args.random:
+        ranges = {}
+        for name, value in map(_parse_assignment, args.range):
+            low, high = value.split(":")
+            ranges[name] = (json.loads(low), json.loads(high))
+        # Random settings are layered on top of every grid point
+        points = [{**p, **r} for p in points for r in random_points(ranges, args.random, args.base_seed)]
+
+    rows = run_sweep(points, seeds=args.seeds, duration=args.duration, base_seed=args.base_seed,
+                     mode=args.mode, workers=args.workers)
+    for index, overrides, summary in write_csv(args.out, points, rows):
+        print(f"[{index + 1}/{len(points)}] {overrides} -> "
+              f"money {summary['money_mean']:.1f}, loss {summary['loss_rate']:.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+# systems/arrivals.py
+import numpy as np
+
+
+class RateProfile:
+    """
+    Arrival rate that changes over the shift, e.g. a lunch rush.
+    points are (time_seconds, customers_per_second) pairs; the rate is
+    linear between them and holds the last value after the end.
+    """
+
+    def __init__(self, points):
+        points = sorted(points)
+        self.times = np.array([t for t, _ in points], dtype=float)
+        self.rates = np.array([r for _, r in points], dtype=float)
+        self.max_rate = float(self.rates.max())
+
+    def __call__(self, t):
+        return np.interp(t, self.times, self.rates)
+
+    def max_after(self, t):
+        """Highest rate from time t on (0 once the profile has closed for good)."""
+        later = self.rates[self.times > t]
+        return max(float(self(t)), float(later.max()) if len(later) else 0.0)
+
+
+def lunch_rush(base_rate, peak_rate, start, peak, end):
+    # Ramp from base up to peak and back down again by end
+    return RateProfile([(0, base_rate), (start, base_rate), (peak, peak_rate),
+                        (end, base_rate)])
+
+
+class ArrivalStream:
+    """
+    Arrival times, orders and patience drawn from one seeded numpy
+    Generator in blocks, so each spawn is just an array index.
+
+    With a RateProfile the arrivals are a non-homogeneous Poisson process,
+    sampled by thinning a whole block at once: candidates come in at the
+    profile's peak rate and each is kept with probability rate(t) / peak.
+    """
+
+    def __init__(self, rng, rate, patience_mean, patience_std, min_patience,
+                 n_orders, profile=None, block=256):
+        self._rng = rng
+        self._rng_state = None  # Clones start with only this, see rng
+        self.rate = rate
+        self.profile = profile
+        self.patience_mean = patience_mean
+        self.patience_std = patience_std
+        self.min_patience = min_patience
+        self.n_orders = n_orders
+        self.block = block
+
+        self.clock = 0.0  # Time of the last candidate arrival drawn
+        self.times = np.empty(0)
+        self.time_index = 0
+        self.orders = np.empty(0, dtype=np.int64)
+        self.patience = np.empty(0)
+        self.customer_index = 0
+
+    @property
+    def rng(self):
+        # Building a Generator costs more than the rest of a clone, so clones
+        # get the state and only build one when they need a new block
+        if self._rng is None:
+            self._rng = np.random.Generator(np.random.PCG64())
+            self._rng.bit_generator.state = self._rng_state
+        return self._rng
+
+    def rng_state(self):
+        return self._rng_state if self._rng is None else self._rng.bit_generator.state
+
+    def clone(self, seed=None):
+        """
+        Copy of the stream. The blocks already drawn are shared, since
+        refills replace them instead of writing into them. With a seed the
+        copy forgets the draws not used yet and makes its own from there.
+        """
+        copy = ArrivalStream.__new__(ArrivalStream)
+        copy.__dict__.update(self.__dict__)
+        if seed is None:
+            copy._rng = None
+            copy._rng_state = self.rng_state()
+            return copy
+        copy._rng = np.random.default_rng(seed)
+        if self.time_index:
+            # Arrivals are memoryless: carry on from the last one handed out
+            copy.clock = float(self.times[self.time_index - 1])
+        copy.times = np.empty(0)
+        copy.time_index = 0
+        copy.orders = np.empty(0, dtype=np.int64)
+        copy.patience = np.empty(0)
+        copy.customer_index = 0
+        return copy
+
+    # --- ARRIVAL TIMES ---
+    def _refill_times(self):
+        while True:
+            # Nobody comes any more (a zero rate, or a profile that closed): one arrival at inf
+            peak = self.rate if self.profile is None else self.profile.max_after(self.clock)
+            if peak <= 0:
+                times = np.array([np.inf])
+            elif self.profile is None:
+                gaps = self.rng.exponential(1 / self.rate, self.block)
+                times = self.clock + np.cumsum(gaps)
+                self.clock = times[-1]
+            else:
+                peak = self.profile.max_rate
+                gaps = self.rng.exponential(1 / peak, self.block)
+                candidates = self.clock + np.cumsum(gaps)
+                keep = self.rng.random(self.block) * peak < self.profile(candidates)
+                times = candidates[keep]
+                self.clock = candidates[-1]
+            if len(times):
+                break
+        self.times = times
+        self.time_index = 0
+
+    def next_time(self):
+        """Absolute shift time of the next arrival, inf if nobody else will come."""
+        if self.time_index == len(self.times):
+            self._refill_times()
+        t = self.times[self.time_index]
+        self.time_index += 1
+        return float(t)
+
+    # --- CUSTOMERS ---
+    def _refill_customers(self):
+        self.orders = self.rng.integers(self.n_orders, size=self.block)
+        patience = self.rng.normal(self.patience_mean, self.patience_std, self.block)
+        self.patience = np.maximum(self.min_patience, patience)
+        self.customer_index = 0
+
+    def next_customer(self):
+        """(order id, patience) for the next customer who joins the line."""
+        if self.customer_index == len(self.orders):
+            self._refill_customers()
+        i = self.customer_index
+        self.customer_index += 1
+        return int(self.orders[i]), float(self.patience[i])
@@ -0,0 +1,284 @@
+# systems/batch.py
+import numpy as np
+from settings import FPS
+from systems.arrivals import RateProfile
+from systems.recipes import RECIPE_BOOK
+from systems.simulation import LINE_SPOTS, shift_settings
+
+NOOP = 0
+
+
+class BatchShift:
+    """
+    N independent restaurants stepped in lockstep, every piece of state an
+    array with one row per restaurant: money, stock and ready dishes, the
+    stoves (dish and finish time per slot), the line (order and deadline
+    per spot, kept packed at the front) and the stats.
+
+    step(actions) takes one action per restaurant (NOOP, a buy, a cook or
+    serve; see buy_action / cook_action / serve_action) and returns
+    (observations, rewards, done) as arrays, rewards being the change in
+    money. Each step follows Shift.step: actions, then timeouts, arrivals
+    and the kitchen. Arrivals are frame-stepped (at most one per restaurant
+    per step, probability 1 - exp(-rate * dt)) and all random numbers come
+    from one seeded Generator in blocks of steps, a column per restaurant.
+
+    Finished restaurants (game over or past duration) are reset in place
+    when auto_reset is on, and their results are kept in completed().
+    """
+
+    def __init__(self, n, seed=None, overrides=None, dt=1 / FPS, duration=600,
+                 auto_reset=True, block=64, recipes=RECIPE_BOOK):
+        self.n = n
+        self.rng = np.random.default_rng(seed)
+        self.dt = dt
+        self.duration = duration
+        self.auto_reset = auto_reset
+        self.block = block
+        self.recipes = recipes
+
+        # Balance values, shared by every restaurant
+        settings = shift_settings(overrides)
+        self.settings = settings
+        self.arrival_rate = settings["ARRIVAL_RATE"]
+        profile = settings["ARRIVAL_PROFILE"]
+        self.profile = RateProfile(profile) if profile else None
+        self.patience_mean = settings["PATIENCE_MEAN"]
+        self.patience_std = settings["PATIENCE_STD"]
+        self.min_patience = settings["MIN_PATIENCE"]
+        self.max_lost = settings["MAX_LOST"]
+        self.slots = settings["MAX_COOKING_SLOTS"]
+        self.spots = LINE_SPOTS
+
+        n_ing = len(recipes.ingredients)
+        n_dish = len(recipes.dishes)
+        self.ingredient_prices = np.array([settings["INGREDIENT_PRICES"][i] for i in recipes.ingredients])
+        self.menu_prices = np.array([settings["MENU_PRICES"][d] for d in recipes.dishes])
+        self.cooking_times = np.array([settings["COOKING_TIMES"][d] for d in recipes.dishes], dtype=float)
+
+        # Action ids: 0 noop, then one per ingredient, one per dish, then serve
+        self.buy_actions = {name: 1 + i for i, name in enumerate(recipes.ingredients)}
+        self.cook_actions = {name: 1 + n_ing + d for d, name in enumerate(recipes.dishes)}
+        self.serve_action = 1 + n_ing + n_dish
+        self.n_actions = self.serve_action + 1
+
+        # --- STATE (one row per restaurant) ---
+        self.time = np.zeros(n)
+        self.money = np.zeros(n, dtype=np.int64)
+        self.stock = np.zeros((n, n_ing), dtype=np.int64)
+        self.ready = np.zeros((n, n_dish), dtype=np.int64)
+        self.stove_dish = np.full((n, self.slots), -1)      # -1 = free
+        self.stove_done = np.full((n, self.slots), np.inf)
+        self.line_order = np.zeros((n, self.spots), dtype=np.int64)
+        self.line_deadline = np.full((n, self.spots), np.inf)  # inf past the end of the line
+        self.line_len = np.zeros(n, dtype=np.int64)
+        self.arrived = np.zeros(n, dtype=np.int64)
+        self.turned_away = np.zeros(n, dtype=np.int64)
+        self.served = np.zeros(n, dtype=np.int64)
+        self.lost = np.zeros(n, dtype=np.int64)
+        self.queue_time = np.zeros(n)
+        self.game_over = np.zeros(n, dtype=bool)
+        self.done = np.zeros(n, dtype=bool)
+
+        self._completed = []
+        self._draws = None
+        self._draw_index = block
+        self.rows = np.arange(n)
+        self.reset()
+
+    def buy_action(self, ingredient):
+        return self.buy_actions[ingredient]
+
+    def cook_action(self, dish):
+        return self.cook_actions[dish]
+
+    # --- RESET ---
+    def reset(self, mask=None):
+        """Start over in the restaurants where mask is True (all if None)."""
+        rows = self.rows if mask is None else np.flatnonzero(mask)
+        self.time[rows] = 0.0
+        self.money[rows] = 100  # Starting cash, as in Inventory
+        self.stock[rows] = 0
+        self.ready[rows] = 0
+        self.stove_dish[rows] = -1
+        self.stove_done[rows] = np.inf
+        self.line_deadline[rows] = np.inf
+        self.line_len[rows] = 0
+        for stat in (self.arrived, self.turned_away, self.served, self.lost, self.queue_time):
+            stat[rows] = 0
+        self.game_over[rows] = False
+        self.done[rows] = False
+        return self.observe()
+
+    # --- RANDOM NUMBERS ---
+    def _draw(self):
+        # One step's worth of (arrival uniforms, orders, patience), from a block
+        if self._draw_index == self.block:
+            shape = (self.block, self.n)
+            patience = self.rng.normal(self.patience_mean, self.patience_std, shape)
+            self._draws = (
+                self.rng.random(shape),
+                self.rng.integers(len(self.recipes.dishes), size=shape),
+                np.maximum(self.min_patience, patience),
+            )
+            self._draw_index = 0
+        i = self._draw_index
+        self._draw_index += 1
+        return tuple(d[i] for d in self._draws)
+
+    # --- ACTIONS ---
+    def _buy(self, actions):
+        rows = np.flatnonzero((actions >= 1) & (actions <= len(self.ingredient_prices)))
+        if not rows.size:
+            return
+        ingredient = actions[rows] - 1
+        cost = self.ingredient_prices[ingredient]
+        ok = self.money[rows] >= cost
+        rows, ingredient = rows[ok], ingredient[ok]
+        self.money[rows] -= cost[ok]
+        self.stock[rows, ingredient] += 1
+
+    def _cook(self, actions):
+        first = 1 + len(self.ingredient_prices)
+        rows = np.flatnonzero((actions >= first) & (actions < self.serve_action))
+        if not rows.size:
+            return
+        dish = actions[rows] - first
+        need = self.recipes.matrix[dish]
+        free = self.stove_dish[rows] < 0
+        ok = free.any(axis=1) & (self.stock[rows] >= need).all(axis=1)
+        rows, dish, need, free = rows[ok], dish[ok], need[ok], free[ok]
+        stove = free.argmax(axis=1)  # Lowest free stove, like Kitchen
+        self.stock[rows] -= need
+        self.stove_dish[rows, stove] = dish
+        self.stove_done[rows, stove] = self.time[rows] + self.cooking_times[dish]
+
+    def _serve(self, actions):
+        rows = np.flatnonzero((actions == self.serve_action) & (self.line_len > 0))
+        if not rows.size:
+            return
+        dish = self.line_order[rows, 0]
+        ok = self.ready[rows, dish] > 0
+        rows, dish = rows[ok], dish[ok]
+        self.ready[rows, dish] -= 1
+        self.money[rows] += self.menu_prices[dish]
+        self.served[rows] += 1
+        # Everyone behind moves up a spot
+        self.line_order[rows, :-1] = self.line_order[rows, 1:]
+        self.line_deadline[rows, :-1] = self.line_deadline[rows, 1:]
+        self.line_deadline[rows, -1] = np.inf
+        self.line_len[rows] -= 1
+
+    # --- TIME ---
+    def _expire(self):
+        gone = self.line_deadline <= self.time[:, None]
+        rows = np.flatnonzero(gone.any(axis=1))
+        if not rows.size:
+            return
+        gone = gone[rows]
+        count = gone.sum(axis=1)
+        self.lost[rows] += count
+        self.line_len[rows] -= count
+        # Pack whoever is left to the front, keeping their order
+        keep = np.argsort(gone, axis=1, kind="stable")
+        order = np.take_along_axis(self.line_order[rows], keep, axis=1)
+        deadline = np.take_along_axis(self.line_deadline[rows], keep, axis=1)
+        deadline[np.arange(self.spots) >= self.line_len[rows][:, None]] = np.inf
+        self.line_order[rows] = order
+        self.line_deadline[rows] = deadline
+
+    def _arrive(self, alive):
+        uniform, orders, patience = self._draw()
+        rate = self.arrival_rate if self.profile is None else self.profile(self.time)
+        arriving = alive & (uniform < 1 - np.exp(-rate * self.dt))
+        full = self.line_len >= self.spots
+        self.turned_away += arriving & full
+        rows = np.flatnonzero(arriving & ~full)
+        if not rows.size:
+            return
+        spot = self.line_len[rows]
+        self.line_order[rows, spot] = orders[rows]
+        self.line_deadline[rows, spot] = self.time[rows] + patience[rows]
+        self.line_len[rows] += 1
+        self.arrived[rows] += 1
+
+    def _finish_cooking(self):
+        finished = self.stove_done <= self.time[:, None]
+        if not finished.any():
+            return
+        rows, stoves = np.nonzero(finished)
+        np.add.at(self.ready, (rows, self.stove_dish[rows, stoves]), 1)
+        self.stove_dish[rows, stoves] = -1
+        self.stove_done[rows, stoves] = np.inf
+
+    def step(self, actions):
+        """
+        Advance every restaurant by dt. Returns (observations, rewards, done).
+        actions holds one action id per restaurant; ids outside
+        0..n_actions - 1 raise ValueError instead of silently doing nothing.
+        """
+        actions = np.asarray(actions)
+        if ((actions < 0) | (actions >= self.n_actions)).any():
+            raise ValueError(f"Action ids must be 0..{self.n_actions - 1}, got {actions.min()}..{actions.max()}")
+        alive = ~self.done
+        actions = np.where(alive, actions, NOOP)
+        money_before = self.money.copy()
+
+        self._buy(actions)
+        self._cook(actions)
+        self._serve(actions)
+
+        self.queue_time += self.line_len * (self.dt * alive)
+        self.time += self.dt * alive
+        self._expire()
+        self._arrive(alive)
+        self._finish_cooking()
+
+        self.game_over |= self.lost >= self.max_lost
+        done = alive & (self.game_over | (self.time >= self.duration))
+        self.done |= done
+        rewards = self.money - money_before
+
+        if self.auto_reset and done.any():
+            self._completed.append(self.results(done))
+            self.reset(done)
+        return self.observe(), rewards, done
+
+    # --- OUTPUT ---
+    def observe(self):
+        """Observations as arrays with one row per restaurant."""
+        has_front = self.line_len > 0
+        cooking = (self.stove_dish[:, :, None] == np.arange(len(self.recipes.dishes))).sum(axis=1)
+        return {
+            "time": self.time.copy(),
+            "money": self.money.copy(),
+            "stock": self.stock.copy(),
+            "ready": self.ready.copy(),
+            "cooking": cooking,
+            "free_stoves": (self.stove_dish < 0).sum(axis=1),
+            "line": self.line_len.copy(),
+            "front_order": np.where(has_front, self.line_order[:, 0], -1),
+            "line_orders": np.where(np.arange(self.spots) < self.line_len[:, None], self.line_order, -1),
+            "front_patience": np.where(has_front, self.line_deadline[:, 0] - self.time, 0.0),
+        }
+
+    def results(self, mask=None):
+        """Shift.results() as arrays, for the restaurants in mask (all if None)."""
+        rows = self.rows if mask is None else np.flatnonzero(mask)
+        time = self.time[rows]
+        return {
+            "time": time,
+            "money": self.money[rows],
+            "arrived": self.arrived[rows],
+            "turned_away": self.turned_away[rows],
+            "served": self.served[rows],
+            "lost": self.lost[rows],
+            "avg_queue": np.divide(self.queue_time[rows], time, out=np.zeros(len(rows)), where=time > 0),
+            "game_over": self.game_over[rows],
+        }
+
+    def completed(self):
+        """Results of every restaurant that finished and was auto-reset so far."""
+        if not self._completed:
+            return self.results(np.zeros(self.n, dtype=bool))
+        return {key: np.concatenate([r[key] for r in self._completed]) for key in self._completed[0]}
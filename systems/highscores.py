@@ -0,0 +1,139 @@
+# systems/highscores.py
+import heapq
+import json
+import os
+import queue
+import threading
+
+
+class HighscoreStore:
+    """
+    Top-K highscores kept in memory as a min-heap, so is_highscore() is a
+    single comparison with the lowest kept score.
+
+    New entries are appended to a journal file (one JSON line each) and
+    every `compact_every` entries the snapshot file is rewritten and the
+    journal emptied. All disk work happens on a background thread and every
+    rewrite goes through a temp file + rename, so a crash never leaves a
+    half-written file and the game loop never waits on the disk.
+
+    The snapshot is {"seq": n, "scores": [...]}; journal lines with a seq
+    at or below n are already in it. A plain list (the old format) still loads.
+    """
+
+    def __init__(self, path, k=5, compact_every=20):
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.k = k
+        self.compact_every = compact_every
+
+        self.heap = []     # (score, seq, name), lowest kept score first
+        self.seq = 0
+        self.version = 0   # Bumped on every change, handy as a cache key
+        self._top = None
+        self._since_compact = 0
+        self._load()
+
+        self._jobs = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+
+    # --- QUERIES ---
+    def is_highscore(self, score):
+        return len(self.heap) < self.k or score > self.heap[0][0]
+
+    def top(self):
+        """Entries as [{"name", "score"}], best first. Cached until the next add."""
+        if self._top is None:
+            ordered = sorted(self.heap, key=lambda e: (-e[0], e[1]))
+            self._top = [{"name": name, "score": score} for score, _, name in ordered]
+        return self._top
+
+    # --- UPDATES ---
+    def add(self, name, score):
+        self.seq += 1
+        self._push(score, self.seq, name)
+        self._jobs.put(("append", {"seq": self.seq, "name": name, "score": score}))
+
+        self._since_compact += 1
+        if self._since_compact >= self.compact_every:
+            self._since_compact = 0
+            self._jobs.put(("compact", self._snapshot()))
+
+    def _push(self, score, seq, name):
+        if len(self.heap) < self.k:
+            heapq.heappush(self.heap, (score, seq, name))
+        else:
+            heapq.heappushpop(self.heap, (score, seq, name))
+        self._top = None
+        self.version += 1
+
+    def _snapshot(self):
+        return {"seq": self.seq, "scores": self.top()}
+
+    # --- DISK (background thread) ---
+    def _load(self):
+        snapshot_seq = 0
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, list):
+                entries = data
+            else:
+                entries = data.get("scores", [])
+                snapshot_seq = data.get("seq", 0)
+            for e in entries:
+                self.seq += 1
+                self._push(e["score"], self.seq, e["name"])
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        self.seq = max(self.seq, snapshot_seq)
+
+        try:
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        e = json.loads(line)
+                    except ValueError:
+                        break  # Torn last line from a crash
+                    if e["seq"] > snapshot_seq:
+                        self._push(e["score"], e["seq"], e["name"])
+                        self.seq = max(self.seq, e["seq"])
+        except OSError:
+            pass
+
+    def _write_loop(self):
+        while True:
+            job, payload = self._jobs.get()
+            try:
+                if job == "append":
+                    with open(self.journal_path, "a", encoding="utf-8") as f:
+                        f.write(json.dumps(payload) + "\n")
+                elif job == "compact":
+                    self._atomic_write(self.path, json.dumps(payload, indent=2))
+                    self._atomic_write(self.journal_path, "")
+            except OSError as e:
+                print("Failed to save highscores:", e)
+            finally:
+                self._jobs.task_done()
+            if job == "stop":
+                return
+
+    def _atomic_write(self, path, text):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def flush(self):
+        # Wait until everything queued so far is on disk
+        self._jobs.join()
+
+    def close(self):
+        """Fold the journal into the snapshot and stop the writer thread."""
+        if self._since_compact:
+            self._jobs.put(("compact", self._snapshot()))
+        self._jobs.put(("stop", None))
+        self._writer.join()
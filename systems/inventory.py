@@ -1,16 +1,64 @@
 # systems/inventory.py
+import numpy as np
+from systems.recipes import RECIPE_BOOK
+
+
+class Counts:
+    """Name-keyed dict view of a count array (ingredient or dish ids)."""
+    __slots__ = ("names", "ids", "array")
+
+    def __init__(self, names, ids, array):
+        self.names = names
+        self.ids = ids
+        self.array = array
+
+    def __getitem__(self, name):
+        return int(self.array[self.ids[name]])
+
+    def __setitem__(self, name, value):
+        self.array[self.ids[name]] = value
+
+    def get(self, name, default=None):
+        return self[name] if name in self.ids else default
+
+    def __contains__(self, name):
+        return name in self.ids
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self):
+        return len(self.names)
+
+    def keys(self):
+        return list(self.names)
+
+    def items(self):
+        return list(zip(self.names, self.array.tolist()))
+
+
 class Inventory:
-    def __init__(self):
+    def __init__(self, recipes=RECIPE_BOOK):
         self.money = 100  # Starting cash
-        # Raw Ingredients
-        self.items = {
-            "Rice": 0, "Egg": 0, "Veggie": 0, "Chicken": 0
-        }
-        
-        # Cooked Food (Ready to serve)
-        self.cooked_food = {
-            "Fried Rice": 0, "Chicken Rice": 0, "Omelet": 0
-        }
+        self.recipes = recipes
+
+        # Raw Ingredients and Cooked Food (Ready to serve), one slot per id
+        self.stock = np.zeros(len(recipes.ingredients), dtype=np.int64)
+        self.ready = np.zeros(len(recipes.dishes), dtype=np.int64)
+
+        # Same data by name, for the HUD and anything that thinks in names
+        self.items = Counts(recipes.ingredients, recipes.ingredient_id, self.stock)
+        self.cooked_food = Counts(recipes.dishes, recipes.dish_id, self.ready)
+
+    def clone(self):
+        copy = Inventory.__new__(Inventory)
+        copy.money = self.money
+        copy.recipes = self.recipes
+        copy.stock = self.stock.copy()
+        copy.ready = self.ready.copy()
+        copy.items = Counts(self.recipes.ingredients, self.recipes.ingredient_id, copy.stock)
+        copy.cooked_food = Counts(self.recipes.dishes, self.recipes.dish_id, copy.ready)
+        return copy
 
     def can_afford(self, cost):
         return self.money >= cost
@@ -18,6 +66,22 @@ class Inventory:
     def buy(self, item, cost):
         if self.can_afford(cost):
             self.money -= cost
-            self.items[item] += 1
+            self.stock[self.recipes.ingredient_id[item]] += 1
             return True  # Purchase successful
-        return False     # Not enough money
\ No newline at end of file
+        return False     # Not enough money
+
+    # --- WHAT CAN I COOK ---
+    def missing(self, dish):
+        return self.recipes.missing(self.stock, dish)
+
+    def cookable(self):
+        """Bool array by dish id: enough ingredients to cook it once."""
+        return self.recipes.feasible(self.stock)
+
+    def max_cookable(self):
+        """How many of each dish the ingredients on hand could make, by dish id."""
+        return self.recipes.max_cookable(self.stock)
+
+    def use(self, dish):
+        # Take one dish worth of ingredients (the caller checked missing())
+        self.stock -= self.recipes.needs(dish)
@@ -1,77 +1,155 @@
 # systems/kitchen.py
-import pygame
-from settings import RECIPES, COOKING_TIMES
+import heapq
+from settings import WIDTH, COOKING_TIMES, MAX_COOKING_SLOTS
+from systems.telemetry import COOK, COOK_FAILED, READY, FULL, MISSING
 
 class Kitchen:
-    def __init__(self, inventory):
+    def __init__(self, inventory, max_slots=MAX_COOKING_SLOTS, cooking_times=COOKING_TIMES, telemetry=None):
         self.inventory = inventory
-        self.slots = [] # List of active cooking tasks
-        self.max_slots = 4
+        self.telemetry = telemetry  # Event log, if the shift keeps one
+        self.max_slots = max_slots
+        self.cooking_times = cooking_times
+        self.time = 0.0  # Kitchen clock, kept in step with the Shift
+
+        # Active cooking tasks as a min-heap of (done_at, seq, task), so only
+        # finished tasks are touched when time moves on
+        self.tasks = []
+        self.seq = 0
+        self.stoves = [None] * max_slots      # stove index -> task, for drawing
+        self.free_stoves = list(range(max_slots))  # min-heap, lowest stove first
+        self.cooking = {dish: 0 for dish in inventory.recipes.dishes}  # dish -> tasks in progress
+        self.bar = None  # Progress bar strip, built on first draw
+
+    def clone(self, inventory):
+        # Task dicts never change once started, so the copy shares them
+        copy = Kitchen.__new__(Kitchen)
+        copy.__dict__.update(self.__dict__)
+        copy.inventory = inventory
+        copy.telemetry = None
+        copy.tasks = list(self.tasks)
+        copy.stoves = list(self.stoves)
+        copy.free_stoves = list(self.free_stoves)
+        copy.cooking = dict(self.cooking)
+        return copy
 
     def start_cooking(self, dish_name):
         # 1. Check if we have an empty stove
-        if len(self.slots) >= self.max_slots:
-            print("Kitchen is full!")
+        if len(self.tasks) >= self.max_slots:
+            if self.telemetry:
+                self.telemetry.emit(COOK_FAILED, self.time, item=self.inventory.recipes.dish_id[dish_name], detail=FULL)
             return (False, "full")
 
-        # 2. Check if we have ingredients
-        recipe = RECIPES[dish_name]
-        missing = {}
-        for ingredient, qty in recipe.items():
-            have = self.inventory.items.get(ingredient, 0)
-            if have < qty:
-                missing[ingredient] = qty - have
-
+        # 2. Check if we have ingredients (one array compare for the whole recipe)
+        missing = self.inventory.missing(dish_name)
         if missing:
             # Return missing ingredients with quantities required
-            print(f"Missing ingredients for {dish_name}: {missing}")
+            if self.telemetry:
+                self.telemetry.emit(COOK_FAILED, self.time, item=self.inventory.recipes.dish_id[dish_name], detail=MISSING)
             return (False, missing)
 
         # 3. Deduct ingredients
-        for ingredient, qty in recipe.items():
-            self.inventory.items[ingredient] -= qty
+        self.inventory.use(dish_name)
 
-        # 4. Start the timer
-        # Task format: [Name, Time_Left, Total_Time]
+        # 4. Start the timer on the lowest free stove
+        # Task format: name, dish id, stove, absolute finish time and total cook time
+        stove = heapq.heappop(self.free_stoves)
         new_task = {
             "name": dish_name,
-            "time": COOKING_TIMES[dish_name],
-            "total": COOKING_TIMES[dish_name]
+            "dish": self.inventory.recipes.dish_id[dish_name],
+            "stove": stove,
+            "done_at": self.time + self.cooking_times[dish_name],
+            "total": self.cooking_times[dish_name]
         }
-        self.slots.append(new_task)
-        print(f"Started cooking {dish_name}")
+        heapq.heappush(self.tasks, (new_task["done_at"], self.seq, new_task))
+        self.seq += 1
+        self.stoves[stove] = new_task
+        self.cooking[dish_name] += 1
+        if self.telemetry:
+            self.telemetry.emit(COOK, self.time, stove, new_task["dish"], new_task["total"])
         return (True, None)
 
+    def remaining(self, task, time=None):
+        # time lets the renderer ask about a moment between two steps
+        if time is None:
+            time = self.time
+        return min(task["total"], max(0.0, task["done_at"] - time))
+
+    def cooking_count(self, dish_name):
+        return self.cooking[dish_name]
+
+    def next_completion_time(self):
+        # Kitchen time of the next dish to finish, or None if nothing cooks
+        return self.tasks[0][0] if self.tasks else None
+
     def update(self, dt):
-        # Loop backwards so we can remove items safely
-        for task in self.slots[:]:
-            task["time"] -= dt
-            
-            # If cooking is done
-            if task["time"] <= 0:
-                self.inventory.cooked_food[task["name"]] += 1
-                self.slots.remove(task)
-                print(f"{task['name']} is ready!")
+        self.advance_to(self.time + dt)
+
+    def advance_to(self, time):
+        self.time = time
+
+        # Pop everything that is done; unfinished tasks are never looked at
+        while self.tasks and self.tasks[0][0] <= self.time:
+            _, _, task = heapq.heappop(self.tasks)
+            self.inventory.ready[task["dish"]] += 1
+            self.cooking[task["name"]] -= 1
+            self.stoves[task["stove"]] = None
+            heapq.heappush(self.free_stoves, task["stove"])
+            if self.telemetry:
+                self.telemetry.emit(READY, task["done_at"], task["stove"], task["dish"])
+
+    def visible_slots(self):
+        # Stoves past the right edge of the screen are not drawn
+        return min(self.max_slots, (WIDTH - 400) // 80)
+
+    # pygame is imported where the kitchen is drawn, so headless shifts
+    # (sweeps, replays, BatchShift) never load it
+    def bounds(self):
+        import pygame
+        return pygame.Rect(400, 500, self.visible_slots() * 80, 50)
+
+    def widgets(self, time=None):
+        # The stoves only look different when a bar grows by a whole pixel
+        key = tuple(None if task is None else int(70 * (1 - self.remaining(task, time) / task["total"]))
+                    for task in self.stoves[:self.visible_slots()])
+        return [("kitchen", self.bounds(), key, lambda surface: self.draw_progress(surface, time))]
 
     def draw(self, surface):
+        self.draw_stoves(surface)
+        self.draw_progress(surface)
+
+    def draw_stoves(self, surface):
         # Draw the 4 Stove Slots at the bottom right
+        import pygame
         start_x = 400
         start_y = 500
-        
-        # Draw 4 empty boxes (stoves)
-        for i in range(self.max_slots):
+
+        # Draw 4 empty boxes (stoves); these never change, so they can be baked
+        for i in range(self.visible_slots()):
             rect = pygame.Rect(start_x + (i * 80), start_y, 70, 50)
             pygame.draw.rect(surface, (100, 100, 100), rect, 2) # Gray outline
-            
-            # If there is a task in this slot, draw a green progress bar
-            if i < len(self.slots):
-                task = self.slots[i]
-                ratio = task["time"] / task["total"]
-                
-                # Fill logic (Green bar shrinking)
-                fill_width = 70 * (1 - ratio) # Invert so it fills up
-                pygame.draw.rect(surface, (0, 255, 0), (rect.x, rect.y, fill_width, 50))
-                
+
+    def progress_bars(self, time=None):
+        """(source, dest, area) items for surface.blits(), one per busy stove."""
+        start_x = 400
+        start_y = 500
+        if self.bar is None:
+            from ui.bars import bar_strip
+            self.bar = bar_strip(70, 50, [(0, 255, 0)])
+        strip = self.bar
+
+        bars = []
+        for i in range(self.visible_slots()):
+            # If there is a task on this stove, draw a green progress bar
+            task = self.stoves[i]
+            if task is not None:
+                ratio = self.remaining(task, time) / task["total"]
+                # Invert so it fills up
+                bars.append(strip.blit_item((start_x + (i * 80), start_y), 1 - ratio))
+
                 # Optional: Text
                 # font = pygame.font.SysFont(None, 20)
-                # surface.blit(font.render(task["name"][:3], True, (255,255,255)), (rect.x+5, rect.y+10))
\ No newline at end of file
+                # surface.blit(font.render(task["name"][:3], True, (255,255,255)), (start_x + (i * 80) + 5, start_y + 10))
+        return bars
+
+    def draw_progress(self, surface, time=None):
+        surface.blits(self.progress_bars(time), doreturn=False)
@@ -0,0 +1,62 @@
+# systems/policies.py
+import numpy as np
+from systems.batch import NOOP
+
+# Scripted players for headless Shifts: policy(shift) is called once per
+# frame (Shift.run) or once per event (Shift.run_events) and should do
+# everything it wants to do right now.
+
+def greedy_policy(shift, lookahead=4):
+    """Serve whoever we can, then cook (buying what's missing) for the front of the line."""
+    while shift.serve()[0]:
+        pass
+
+    inventory = shift.inventory
+    wanted = [shift.dishes[order] for order in shift.customers.orders(lookahead)]
+    for dish in wanted:
+        # Only cook what the next few customers need and isn't on the way
+        if wanted.count(dish) <= inventory.cooked_food[dish] + shift.kitchen.cooking_count(dish):
+            continue
+        for ingredient, qty in inventory.missing(dish).items():
+            for _ in range(qty):
+                if not shift.buy(ingredient):
+                    break
+        shift.cook(dish)
+
+
+def batch_greedy_policy(batch, obs, lookahead=None):
+    """
+    greedy_policy for a BatchShift, one action per restaurant per step:
+    serve the front customer if their dish is ready, else find the first
+    of the next `lookahead` customers (default: one per stove) whose dish
+    isn't ready or on a stove yet, and cook it, or buy the first
+    ingredient it still needs.
+    """
+    rows = np.arange(batch.n)
+    lookahead = batch.slots if lookahead is None else lookahead
+    orders = obs["line_orders"][:, :lookahead]
+    front = obs["front_order"]
+    has_front = front >= 0
+    can_serve = has_front & (obs["ready"][rows, np.where(has_front, front, 0)] > 0)
+
+    # How many of the customers so far want each one's dish, against what's ready or cooking
+    n_dish = len(batch.recipes.dishes)
+    in_line = orders >= 0
+    dishes = np.where(in_line, orders, 0)
+    wants = np.cumsum((dishes[:, :, None] == np.arange(n_dish)) & in_line[:, :, None], axis=1)
+    wanted_so_far = np.take_along_axis(wants, dishes[:, :, None], axis=2)[:, :, 0]
+    have = np.take_along_axis(obs["ready"] + obs["cooking"], dishes, axis=1)
+    short_of = in_line & (wanted_so_far > have)
+    wanted = short_of.any(axis=1) & ~can_serve
+    dish = dishes[rows, short_of.argmax(axis=1)]
+
+    short = batch.recipes.matrix[dish] > obs["stock"]
+    can_cook = wanted & ~short.any(axis=1) & (obs["free_stoves"] > 0)
+    must_buy = wanted & short.any(axis=1)
+
+    first = 1 + len(batch.recipes.ingredients)
+    actions = np.full(batch.n, NOOP)
+    actions[must_buy] = 1 + short.argmax(axis=1)[must_buy]
+    actions[can_cook] = first + dish[can_cook]
+    actions[can_serve] = batch.serve_action
+    return actions
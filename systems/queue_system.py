@@ -0,0 +1,125 @@
+# systems/queue_system.py
+import heapq
+from collections import deque
+from systems.telemetry import TIMEOUT
+
+
+class QueuedCustomer:
+    """A customer waiting in line. Pure data, the sprite lives in main.py."""
+    __slots__ = ("uid", "order", "max_patience", "deadline", "x", "prev_x", "gone")
+
+    def __init__(self, uid, order, patience, deadline, x):
+        self.uid = uid
+        self.order = order
+        self.max_patience = patience
+        self.deadline = deadline  # Shift time when they give up
+        self.x = x
+        self.prev_x = x           # x before the last slide, for render interpolation
+        self.gone = False         # Served or walked out
+
+    def copy(self):
+        customer = QueuedCustomer(self.uid, self.order, self.max_patience, self.deadline, self.x)
+        customer.prev_x = self.prev_x
+        return customer
+
+
+class CustomerQueue:
+    """
+    Customer arrival & service logic.
+
+    The line is a deque (FIFO), timeouts come off a min-heap on patience
+    deadline, and patience itself is derived from the deadline instead of
+    being ticked down. Arrival, serve and timeout are O(log n) and nothing
+    per frame walks the whole line. Customers who leave from the middle are
+    only flagged and get dropped once they reach the front.
+    """
+
+    def __init__(self, telemetry=None):
+        self.telemetry = telemetry  # Event log for timeouts, if the shift keeps one
+        self.line = deque()
+        self.deadlines = []  # min-heap of (deadline, uid, customer)
+        self.count = 0       # People actually waiting
+        self.next_uid = 0
+
+    def __len__(self):
+        return self.count
+
+    def add(self, order, patience, now, x):
+        customer = QueuedCustomer(self.next_uid, order, patience, now + patience, x)
+        self.next_uid += 1
+        self.line.append(customer)
+        heapq.heappush(self.deadlines, (customer.deadline, customer.uid, customer))
+        self.count += 1
+        return customer
+
+    def clone(self):
+        """Copy of the line with only the people still waiting in it, without telemetry."""
+        copy = CustomerQueue()
+        copy.next_uid = self.next_uid
+        copy.line = deque(customer.copy() for customer in self.waiting())
+        copy.deadlines = [(c.deadline, c.uid, c) for c in copy.line]
+        heapq.heapify(copy.deadlines)
+        copy.count = len(copy.line)
+        return copy
+
+    def front(self):
+        # Drop people at the front who already walked out
+        while self.line and self.line[0].gone:
+            self.line.popleft()
+        return self.line[0] if self.line else None
+
+    def serve_front(self):
+        customer = self.front()
+        self.line.popleft()
+        customer.gone = True
+        self.count -= 1
+        return customer
+
+    def next_deadline(self):
+        # Earliest deadline of someone still waiting, or None
+        while self.deadlines and self.deadlines[0][2].gone:
+            heapq.heappop(self.deadlines)
+        return self.deadlines[0][0] if self.deadlines else None
+
+    def expire(self, now):
+        """Everyone whose deadline has passed walks out. Returns how many."""
+        lost = 0
+        while self.deadlines and self.deadlines[0][0] <= now:
+            _, _, customer = heapq.heappop(self.deadlines)
+            if not customer.gone:
+                customer.gone = True
+                lost += 1
+                if self.telemetry:
+                    self.telemetry.emit(TIMEOUT, customer.deadline, customer.uid, customer.order,
+                                        customer.max_patience)
+        self.count -= lost
+
+        # Rebuild the deque once it is mostly people who already left
+        if len(self.line) > 2 * self.count + 16:
+            self.line = deque(c for c in self.line if not c.gone)
+        return lost
+
+    def patience(self, customer, now):
+        # now may be a render time slightly before they arrived
+        return min(customer.max_patience, max(0.0, customer.deadline - now))
+
+    def waiting(self, limit=None):
+        """The first `limit` people in line (everyone if None), front first."""
+        n = 0
+        for customer in self.line:
+            if customer.gone:
+                continue
+            if limit is not None and n >= limit:
+                return
+            yield customer
+            n += 1
+
+    def orders(self, limit=None):
+        return [customer.order for customer in self.waiting(limit)]
+
+    def slide(self, dt, start_x, spacing, speed, limit):
+        # Only the first `limit` spots are on screen; nobody further back moves
+        for index, customer in enumerate(self.waiting(limit)):
+            target_x = start_x + (index * spacing)
+            customer.prev_x = customer.x
+            customer.x = max(target_x, min(customer.x, start_x + limit * spacing) - speed * dt)
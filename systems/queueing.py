@@ -0,0 +1,154 @@
+# systems/queueing.py
+import math
+
+import numpy as np
+
+from systems.arrivals import RateProfile
+from systems.recipes import RECIPE_BOOK
+from systems.simulation import LINE_SPOTS, shift_settings
+
+
+def _erfc(x):
+    # Abramowitz & Stegun 7.1.26 (error < 2e-7), vectorized where math.erfc isn't
+    z = np.abs(x)
+    t = 1 / (1 + 0.3275911 * z)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    tail = poly * np.exp(-z * z)
+    return np.where(x >= 0, tail, 2 - tail)
+
+
+def patience_survival(t, mean, std, minimum):
+    """P(patience > t) for patience = max(minimum, Normal(mean, std)), as in ArrivalStream."""
+    t = np.asarray(t, dtype=float)
+    if std <= 0:
+        return (t < max(minimum, mean)).astype(float)
+    return np.where(t < minimum, 1.0, 0.5 * _erfc((t - mean) / (std * math.sqrt(2))))
+
+
+def patience_density(t, mean, std, minimum):
+    # Continuous part only; the point mass at minimum is ignored
+    t = np.asarray(t, dtype=float)
+    if std <= 0:
+        return np.zeros_like(t)
+    z = (t - mean) / std
+    return np.where(t < minimum, 0.0, np.exp(-z * z / 2) / (std * math.sqrt(2 * math.pi)))
+
+
+def release_capacity(times, servers, chains=1024, steps=192, seed=0):
+    """
+    Dishes per second the kitchen can hand out when the line never runs dry.
+
+    Customers are served in line order, so a dish that finishes early waits
+    for the one ahead of it, and a stove only starts the next order when the
+    front customer leaves (greedy_policy cooks for as many customers as
+    there are stoves). With c stoves the gap between two serves is then
+        gap_i = max(cook_i - (gap_{i-c+1} + ... + gap_{i-1}), 0)
+    which is below c / mean(cook time) whenever cook times vary. This runs
+    that recursion over many chains at once with a fixed seed, so the
+    answer is the same every call and takes a few milliseconds.
+    """
+    times = np.asarray(times, dtype=float)
+    if servers <= 1 or times.min() == times.max():
+        return servers / times.mean()
+    rng = np.random.default_rng(seed)
+    cooks = rng.choice(times, size=(steps, chains))
+    recent = np.zeros((servers - 1, chains))  # The last c-1 gaps, as a ring
+    window = np.zeros(chains)                  # ... and their sum
+    warmup = 4 * servers
+    total = 0.0
+    for i in range(steps):
+        gap = np.maximum(cooks[i] - window, 0.0)
+        slot = i % (servers - 1)
+        window += gap - recent[slot]
+        recent[slot] = gap
+        if i >= warmup:
+            total += gap.sum()
+    return (steps - warmup) * chains / total
+
+
+def _chain(rates, deaths):
+    # Stationary distribution of birth-death chains, one row per arrival rate
+    ratios = rates[:, None] / deaths[:, 1:]
+    p = np.concatenate([np.ones((len(rates), 1)), np.cumprod(ratios, axis=1)], axis=1)
+    return p / p.sum(axis=1, keepdims=True)
+
+
+def estimate(overrides=None, duration=600, recipes=RECIPE_BOOK, tolerance=1e-6, max_iterations=100):
+    """
+    Expected steady-state numbers for a Shift with these settings, played
+    by a greedy player (greedy_policy with lookahead = stoves), without
+    simulating it.
+
+    The line is an M/M/c/K queue with abandonment: Poisson arrivals, c
+    stoves, K = LINE_SPOTS places (arrivals to a full line are turned away).
+    The service rate is release_capacity() / c, so head-of-line blocking is
+    priced in. Patience is not exponential, so walkouts follow Whitt's
+    approximation for M/M/c+GI: with n > c in line, the n - c customers
+    waiting for a stove have waited about 1, 2, ... n - c arrival gaps and
+    each leaves at the patience hazard rate for that wait. The hazard is
+    the one of (patience - cooking time), since patience also has to cover
+    the cooking, and the arrival gap is the one of customers who got in
+    line, which depends on the answer: it is found by damped fixed-point
+    iteration.
+
+    With an ARRIVAL_PROFILE the chain is solved at the rate of every
+    second of the shift (pointwise stationary) and the results averaged.
+    """
+    settings = shift_settings(overrides)
+    dishes = recipes.dishes
+    cook = np.array([settings["COOKING_TIMES"][d] for d in dishes], dtype=float)
+    prices = np.array([settings["MENU_PRICES"][d] for d in dishes], dtype=float)
+    costs = recipes.matrix @ np.array([settings["INGREDIENT_PRICES"][i] for i in recipes.ingredients])
+    servers = settings["MAX_COOKING_SLOTS"]
+    patience = (settings["PATIENCE_MEAN"], settings["PATIENCE_STD"], settings["MIN_PATIENCE"])
+
+    profile = settings["ARRIVAL_PROFILE"]
+    if profile:
+        rates = np.asarray(RateProfile(profile)(np.arange(0, duration, 1.0)), dtype=float)
+    else:
+        rates = np.array([float(settings["ARRIVAL_RATE"])])
+    rates = np.maximum(rates, 1e-9)
+
+    capacity = release_capacity(cook, servers)
+    mu = capacity / servers
+    n = np.arange(LINE_SPOTS + 1)
+    busy = np.minimum(n, servers)
+    waiting = np.maximum(n - servers, 0)
+    gaps = np.arange(1, max(LINE_SPOTS - servers, 0) + 1)
+
+    # Rate at which people get in line, per arrival rate (starts at "everyone")
+    joining = rates.copy()
+    for _ in range(max_iterations):
+        # Walkout rate with n in line: hazard of (patience - cook) summed over
+        # the waiting customers, cook times mixed by order share
+        waits = gaps[None, :] / joining[:, None]
+        survival = np.mean([patience_survival(waits + s, *patience) for s in cook], axis=0)
+        density = np.mean([patience_density(waits + s, *patience) for s in cook], axis=0)
+        hazard = density / np.maximum(survival, 1e-12)
+        walkouts = np.concatenate([np.zeros((len(rates), 1)), np.cumsum(hazard, axis=1)], axis=1)[:, waiting]
+
+        p = _chain(rates, busy * mu + walkouts)
+        joined = rates * (1 - p[:, -1])
+        if np.abs(joined - joining).max() < tolerance:
+            break
+        joining = np.maximum(0.5 * (joining + joined), 1e-9)
+
+    full = p[:, -1]
+    served = (p * (busy * mu)).sum(axis=1)   # per second, one per rate
+    lost = (p * walkouts).sum(axis=1)
+
+    served_rate = served.mean()
+    lost_rate = lost.mean()
+    return {
+        "loss_rate": float(lost.sum() / joined.sum()),
+        "turned_away_rate": float((rates * full).sum() / rates.sum()),
+        "avg_queue": float((p * n).sum(axis=1).mean()),
+        "utilization": float(served_rate * cook.mean() / servers),
+        "capacity_per_min": float(capacity * 60),
+        "served_per_min": float(served_rate * 60),
+        "lost_per_min": float(lost_rate * 60),
+        "revenue_per_min": float(served_rate * 60 * prices.mean()),
+        "profit_per_min": float(served_rate * 60 * (prices - costs).mean()),
+        # Expected time until MAX_LOST walkouts end the shift
+        "minutes_to_game_over": float(settings["MAX_LOST"] / (lost_rate * 60)) if lost_rate > 0 else math.inf,
+    }
@@ -0,0 +1,49 @@
+# systems/recipes.py
+import numpy as np
+from settings import RECIPES, INGREDIENT_PRICES
+
+
+class RecipeBook:
+    """
+    RECIPES compiled to integer ids and a dish x ingredient matrix, so
+    questions about every dish (can I cook it, what's missing, how many
+    could I make) are a single array operation on an ingredient stock
+    array instead of a walk over nested dicts.
+    """
+
+    def __init__(self, recipes=RECIPES, ingredients=INGREDIENT_PRICES):
+        self.dishes = list(recipes)            # dish id -> name
+        self.ingredients = list(ingredients)   # ingredient id -> name
+        self.dish_id = {name: i for i, name in enumerate(self.dishes)}
+        self.ingredient_id = {name: i for i, name in enumerate(self.ingredients)}
+
+        self.matrix = np.zeros((len(self.dishes), len(self.ingredients)), dtype=np.int64)
+        for dish, recipe in recipes.items():
+            for ingredient, qty in recipe.items():
+                self.matrix[self.dish_id[dish], self.ingredient_id[ingredient]] = qty
+
+    def needs(self, dish):
+        return self.matrix[self.dish_id[dish]]
+
+    def missing(self, stock, dish):
+        """{ingredient: qty} still needed to cook dish once; empty if it can be cooked."""
+        # One subtraction for the whole recipe; tolist() because numpy's
+        # reductions cost more than they save on a handful of ingredients
+        short = (self.matrix[self.dish_id[dish]] - stock).tolist()
+        if max(short) <= 0:
+            return {}
+        return {self.ingredients[i]: qty for i, qty in enumerate(short) if qty > 0}
+
+    def max_cookable(self, stock):
+        """How many of each dish the stock could make on its own, as an array by dish id."""
+        used = self.matrix > 0
+        per_ingredient = np.where(used, stock // np.where(used, self.matrix, 1), np.iinfo(np.int64).max)
+        return per_ingredient.min(axis=1)
+
+    def feasible(self, stock):
+        """Bool array by dish id: can it be cooked once right now."""
+        return (self.matrix <= stock).all(axis=1)
+
+
+# Shared by every Inventory and Kitchen built from settings.py
+RECIPE_BOOK = RecipeBook()
@@ -0,0 +1,164 @@
+# systems/replay.py
+import json
+import secrets
+import time
+
+from systems.simulation import Shift
+
+# A recording is everything needed to play a Shift again exactly:
+#   {"version": 2, "seed": ..., "overrides": {...}, "tick": 1 / SIM_RATE,
+#    "dt": [[dt, steps], ...],
+#    "commands": [[step, time, command, arg], ...]}
+# dt is run-length encoded: under a fixed tick (SIM_RATE) a whole shift is
+# one [tick, steps] run, and only variable-dt play (tick None) has many
+# runs. Every step of a recording with a tick is exactly that tick, so it
+# plays back the same whatever SIM_RATE the watcher has. Version 1
+# recordings (one dt per step) and ones without a tick still load. A
+# command with step i was given right before the i-th step. Commands are
+# the player's semantic actions (buy, cook, serve, pause, resume), not keys.
+VERSION = 2
+
+
+def new_seed():
+    return secrets.randbits(32)
+
+
+def apply_command(shift, command, arg=None):
+    """Run one recorded player action on the shift and return its result."""
+    if command == "buy":
+        return shift.buy(arg)
+    if command == "cook":
+        return shift.cook(arg)
+    if command == "serve":
+        return shift.serve()
+    if command in ("pause", "resume"):
+        # Paused frames are never stepped, so there is nothing to replay
+        return None
+    raise ValueError(f"Unknown command: {command}")
+
+
+class Recorder:
+    """
+    Collects the seed, every step's dt and every player command of one
+    Shift. With a tick (the fixed step length) every step must be that long.
+    """
+
+    def __init__(self, seed, overrides=None, tick=None):
+        self.seed = seed
+        self.overrides = overrides or {}
+        self.tick = tick
+        self.dts = []  # [dt, steps] runs
+        self.steps = 0
+        self.commands = []
+
+    def command(self, command, arg=None, time=0.0):
+        self.commands.append([self.steps, time, command, arg])
+
+    def step(self, dt):
+        if self.tick is not None and dt != self.tick:
+            raise ValueError(f"Step of {dt} s in a recording with a {self.tick} s tick")
+        if self.dts and self.dts[-1][0] == dt:
+            self.dts[-1][1] += 1
+        else:
+            self.dts.append([dt, 1])
+        self.steps += 1
+
+    def to_dict(self):
+        return {
+            "version": VERSION,
+            "seed": self.seed,
+            "overrides": self.overrides,
+            "tick": self.tick,
+            "dt": self.dts,
+            "commands": self.commands,
+        }
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f)
+
+
+def load_recording(path):
+    with open(path, "r", encoding="utf-8") as f:
+        recording = json.load(f)
+    if recording.get("version") == 1:
+        recording["dt"] = [[dt, 1] for dt in recording["dt"]]
+        recording["version"] = VERSION
+    if recording.get("version") != VERSION:
+        raise ValueError(f"{path}: unsupported recording version {recording.get('version')}")
+    recording.setdefault("tick", None)
+    return recording
+
+
+def recording_steps(recording):
+    return sum(steps for _, steps in recording["dt"])
+
+
+class Replayer:
+    """
+    Plays a recording back one step at a time on a fresh Shift. tick is
+    the recording's fixed step length (None if every step has its own dt),
+    which is what a live game should step the replay at.
+    """
+
+    def __init__(self, recording, telemetry=None):
+        self.recording = recording
+        self.tick = recording.get("tick")
+        if self.tick is not None and any(dt != self.tick for dt, _ in recording["dt"]):
+            raise ValueError(f"Recording has steps that aren't its {self.tick} s tick")
+        self.shift = Shift(seed=recording["seed"], overrides=recording["overrides"], telemetry=telemetry)
+        self.dts = recording["dt"]
+        self.steps = recording_steps(recording)
+        self.commands = recording["commands"]
+        self.index = 0     # Next step to run
+        self.next_cmd = 0  # Next command to apply
+        self.run = 0       # Current [dt, steps] run and steps left in it
+        self.run_left = self.dts[0][1] if self.dts else 0
+
+    @property
+    def done(self):
+        return self.index >= self.steps
+
+    def apply_due(self):
+        # Commands given before the current step, in recorded order
+        while self.next_cmd < len(self.commands) and self.commands[self.next_cmd][0] <= self.index:
+            _, _, command, arg = self.commands[self.next_cmd]
+            apply_command(self.shift, command, arg)
+            self.next_cmd += 1
+
+    def step(self):
+        """Apply due commands and run the next step. Returns its dt."""
+        self.apply_due()
+        while self.run_left == 0:
+            self.run += 1
+            self.run_left = self.dts[self.run][1]
+        dt = self.dts[self.run][0]
+        self.run_left -= 1
+        self.shift.step(dt)
+        self.index += 1
+        if self.done:
+            # Anything done after the last step (e.g. a final serve)
+            self.apply_due()
+        return dt
+
+
+def run_replay(recording, paced=False, telemetry=None):
+    """
+    Replay a whole recording headless. Uncapped by default; paced=True
+    sleeps so every step takes as long as it did when it was recorded.
+    Returns the shift results.
+    """
+    replayer = Replayer(recording, telemetry)
+    if not paced:
+        while not replayer.done:
+            replayer.step()
+        return replayer.shift.results()
+
+    start = time.perf_counter()
+    elapsed = 0.0
+    while not replayer.done:
+        elapsed += replayer.step()
+        delay = start + elapsed - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+    return replayer.shift.results()
@@ -0,0 +1,278 @@
+# systems/simulation.py
+import numpy as np
+from settings import (
+    WIDTH, FPS, ARRIVAL_RATE, ARRIVAL_PROFILE, PATIENCE_MEAN, PATIENCE_STD, MIN_PATIENCE,
+    QUEUE_START_X, SPACING, SLIDE_SPEED, MAX_LOST,
+    MENU_PRICES, INGREDIENT_PRICES, COOKING_TIMES, MAX_COOKING_SLOTS,
+)
+from systems.inventory import Inventory
+from systems.kitchen import Kitchen
+from systems.queue_system import CustomerQueue
+from systems.arrivals import ArrivalStream, RateProfile
+from systems.telemetry import ARRIVE, TURNED_AWAY, BUY, SERVE
+
+# Settings a single Shift can override without touching the settings module
+TUNABLE_SETTINGS = {
+    "ARRIVAL_RATE": ARRIVAL_RATE,
+    "ARRIVAL_PROFILE": ARRIVAL_PROFILE,
+    "PATIENCE_MEAN": PATIENCE_MEAN,
+    "PATIENCE_STD": PATIENCE_STD,
+    "MIN_PATIENCE": MIN_PATIENCE,
+    "MAX_COOKING_SLOTS": MAX_COOKING_SLOTS,
+    "COOKING_TIMES": COOKING_TIMES,
+    "MENU_PRICES": MENU_PRICES,
+    "INGREDIENT_PRICES": INGREDIENT_PRICES,
+    "MAX_LOST": MAX_LOST,
+}
+
+# Spots in line before it runs off the screen
+LINE_SPOTS = -(-(WIDTH - 50 - QUEUE_START_X) // SPACING)
+
+
+def shift_settings(overrides=None):
+    """The default tunable settings with overrides applied (names as in settings.py)."""
+    config = dict(TUNABLE_SETTINGS)
+    for name, value in (overrides or {}).items():
+        if name not in config:
+            raise KeyError(f"Unknown or non-tunable setting: {name}")
+        if isinstance(config[name], dict):
+            # Partial dicts only replace the dishes/ingredients they name
+            value = {**config[name], **value}
+        config[name] = value
+    return config
+
+
+class Shift:
+    """
+    One shift of the restaurant without any display, clock or globals.
+    Step it with a fixed dt (frame stepping) or let run_events() jump
+    from event to event, and drive it through buy() / cook() / serve()
+    like the player would. overrides is a dict of TUNABLE_SETTINGS names,
+    e.g. {"ARRIVAL_RATE": 0.2, "COOKING_TIMES": {"Omelet": 2}}.
+    With a Telemetry every arrival, purchase, cook, serve and timeout is
+    logged to it.
+    """
+
+    def __init__(self, seed=None, overrides=None, telemetry=None):
+        self.telemetry = telemetry
+
+        # Balance values for this shift
+        self.settings = shift_settings(overrides)
+        self.arrival_rate = self.settings["ARRIVAL_RATE"]
+        self.patience_mean = self.settings["PATIENCE_MEAN"]
+        self.patience_std = self.settings["PATIENCE_STD"]
+        self.max_lost = self.settings["MAX_LOST"]
+        self.menu_prices = self.settings["MENU_PRICES"]
+        self.ingredient_prices = self.settings["INGREDIENT_PRICES"]
+
+        # Only spawn if the line isn't going off the screen
+        self.max_queue = LINE_SPOTS
+        self.on_screen = self.max_queue  # Spots drawn and animated
+
+        self.inventory = Inventory()
+        self.dishes = self.inventory.recipes.dishes  # order id -> dish name
+        self.kitchen = Kitchen(self.inventory, self.settings["MAX_COOKING_SLOTS"],
+                               self.settings["COOKING_TIMES"], telemetry)
+        self.customers = CustomerQueue(telemetry)  # FIFO line, front first
+        if telemetry:
+            self.log_to(telemetry, seed=seed, overrides=overrides or {})
+
+        # Arrival times, orders and patience all come from the seeded rng
+        profile = self.settings["ARRIVAL_PROFILE"]
+        self.arrivals = ArrivalStream(
+            np.random.default_rng(seed), self.arrival_rate, self.patience_mean, self.patience_std,
+            self.settings["MIN_PATIENCE"], len(self.dishes),
+            profile=RateProfile(profile) if profile else None)
+
+        self.time = 0.0
+        self.next_arrival = self.arrivals.next_time()
+        self.arrived = 0        # Joined the line
+        self.turned_away = 0    # Line was full
+        self.served = 0
+        self.lost_customers = 0
+        self.queue_time = 0.0   # Integral of line length over time
+        self.game_over = False
+
+    def log_to(self, telemetry, **header):
+        """Log every event from now on to telemetry, after a header naming the ids."""
+        self.telemetry = telemetry
+        self.kitchen.telemetry = telemetry
+        self.customers.telemetry = telemetry
+        telemetry.start({**header, "dishes": self.dishes, "ingredients": self.inventory.recipes.ingredients,
+                         "stoves": self.kitchen.max_slots})
+
+    def clone(self, seed=None):
+        """
+        Independent copy of the shift as it is now, for lookahead players
+        and snapshots. The settings are shared and nothing is re-parsed, so
+        it is a handful of list and array copies. The copy plays the same
+        future unless given a seed, then it draws its own arrivals from
+        here on (forks of one decision exploring different futures).
+        Copies don't log anything; see log_to().
+        """
+        copy = Shift.__new__(Shift)
+        copy.__dict__.update(self.__dict__)
+        copy.telemetry = None
+        copy.inventory = self.inventory.clone()
+        copy.kitchen = self.kitchen.clone(copy.inventory)
+        copy.customers = self.customers.clone()
+        copy.arrivals = self.arrivals.clone(seed)
+        return copy
+
+    # --- ARRIVALS ---
+    def spawn_customer(self):
+        """Add a customer to the back of the line. Returns them, or None if it's full."""
+        if self.max_queue is not None and len(self.customers) >= self.max_queue:
+            self.turned_away += 1
+            if self.telemetry:
+                self.telemetry.emit(TURNED_AWAY, self.time)
+            return None
+
+        queue_pos_x = QUEUE_START_X + (len(self.customers) * SPACING)
+        order, patience = self.arrivals.next_customer()
+        self.arrived += 1
+        customer = self.customers.add(order, patience, self.time, queue_pos_x)
+        if self.telemetry:
+            self.telemetry.emit(ARRIVE, self.time, customer.uid, order, patience)
+        return customer
+
+    # --- PLAYER ACTIONS ---
+    def buy(self, item):
+        price = self.ingredient_prices[item]
+        bought = self.inventory.buy(item, price)
+        if self.telemetry:
+            self.telemetry.emit(BUY, self.time, item=self.inventory.recipes.ingredient_id[item],
+                                value=price, detail=0 if bought else 1)
+        return bought
+
+    def cook(self, dish_name):
+        return self.kitchen.start_cooking(dish_name)
+
+    def serve(self):
+        """Serve the front customer. Returns (True, dish) or (False, dish/None)."""
+        front = self.customers.front()
+        if front is None:
+            return (False, None)
+
+        # Orders are dish ids, the same ids the inventory counts by
+        dish_wanted = self.dishes[front.order]
+        if self.inventory.ready[front.order] <= 0:
+            return (False, dish_wanted)
+
+        self.inventory.ready[front.order] -= 1
+        self.inventory.money += self.menu_prices[dish_wanted]
+        # Mark the customer as served so they don't count as "lost"
+        self.customers.serve_front()
+        self.served += 1
+        if self.telemetry:
+            waited = self.time - (front.deadline - front.max_patience)
+            self.telemetry.emit(SERVE, self.time, front.uid, front.order, waited)
+        return (True, dish_wanted)
+
+    def front_order(self):
+        front = self.customers.front()
+        return None if front is None else self.dishes[front.order]
+
+    def arrive(self):
+        # The scheduled arrival happens now; book the next one
+        customer = self.spawn_customer()
+        self.next_arrival = self.arrivals.next_time()
+        return customer
+
+    def check_game_over(self):
+        if self.lost_customers >= self.max_lost:
+            self.game_over = True
+
+    # --- SIMULATION ---
+    def step(self, dt):
+        """Advance the shift by a fixed dt (one frame)."""
+        if self.game_over:
+            return
+
+        self.queue_time += len(self.customers) * dt
+        self.time += dt
+
+        # Whoever's deadline passed walks out
+        self.lost_customers += self.customers.expire(self.time)
+
+        # Spawning Logic (Poisson)
+        while self.next_arrival <= self.time:
+            self.arrive()
+
+        self.kitchen.advance_to(self.time)
+
+        # Slide Animation for Queue
+        self.customers.slide(dt, QUEUE_START_X, SPACING, SLIDE_SPEED, self.on_screen)
+
+        # Check Game Over Condition
+        self.check_game_over()
+
+    def run(self, duration, dt=1 / FPS, policy=None):
+        """
+        Frame-step the shift until duration seconds pass or the game ends.
+        policy(shift) is called once per frame to play the game.
+        """
+        while not self.game_over and self.time < duration:
+            if policy:
+                policy(self)
+            self.step(dt)
+        return self.results()
+
+    def run_events(self, duration, dt=1 / FPS, policy=None):
+        """
+        Discrete-event version of run() that plays the same game, only
+        without ticking through the frames where nothing happens. The next
+        arrival, patience expiry or cook completion (whichever comes first)
+        is taken from its own priority queue (the arrival stream, the line's
+        deadline heap and the kitchen's completion heap) and snapped up to
+        the frame of dt that would see it; the frames before it are skipped
+        and that frame is a normal step(). Seeded results match run() with
+        the same dt exactly. policy(shift) is called after every event
+        frame instead of every frame, so it has to be a policy that does
+        everything it wants per call (serve all it can, start all the
+        cooking it needs), like greedy_policy.
+        Queue x positions are not animated here.
+        """
+        if policy and self.time < duration:
+            policy(self)
+
+        while not self.game_over and self.time < duration:
+            next_time = min(
+                t for t in (self.next_arrival,
+                            self.customers.next_deadline(),
+                            self.kitchen.next_completion_time(),
+                            duration)
+                if t is not None)
+            self.skip_frames(next_time, dt)
+            self.step(dt)
+
+            if policy and not self.game_over and self.time < duration:
+                policy(self)
+        return self.results()
+
+    def skip_frames(self, until, dt):
+        """
+        Step through the frames before the one that reaches `until`, when
+        nothing but the clocks move. time and queue_time are summed one dt
+        at a time like step() does (np.cumsum adds in order), so they come
+        out bit for bit the same as after that many step(dt) calls.
+        """
+        while self.time + dt < until:
+            frames = max(2, int((until - self.time) / dt) + 1)
+            times = np.cumsum(np.concatenate(([self.time], np.full(frames, dt))))
+            skip = int(np.searchsorted(times, until)) - 1  # Frames still short of until
+            waiting = np.concatenate(([self.queue_time], np.full(skip, len(self.customers) * dt)))
+            self.queue_time = float(np.cumsum(waiting)[-1])
+            self.time = float(times[skip])
+
+    def results(self):
+        return {
+            "time": self.time,
+            "money": self.inventory.money,
+            "arrived": self.arrived,
+            "turned_away": self.turned_away,
+            "served": self.served,
+            "lost": self.lost_customers,
+            "avg_queue": self.queue_time / self.time if self.time else 0.0,
+            "game_over": self.game_over,
+        }
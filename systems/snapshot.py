@@ -0,0 +1,169 @@
+# systems/snapshot.py
+import heapq
+import json
+import os
+import struct
+
+import numpy as np
+
+from systems.simulation import Shift
+from systems.queue_system import QueuedCustomer
+
+# A snapshot is a Shift between two steps, as bytes:
+#   HEADER        magic, version, the shift's counters and clocks, rng state,
+#                 then the length of every section below
+#   settings      the shift's tunable settings as JSON
+#   arrivals      arrival times, orders and patience drawn but not used yet
+#   inventory     stock and ready counts by id (RECIPE_BOOK order)
+#   kitchen       TASK_DTYPE records, one per dish on a stove
+#   line          CUSTOMER_DTYPE records of everyone still waiting, front first
+# Served and walked-out customers, used draws and the telemetry are left
+# out: nothing the shift does from here on reads them.
+MAGIC = b"CDSN"
+VERSION = 1
+
+HEADER = struct.Struct("<4sB"       # magic, version
+                       "ddddd"      # time, next_arrival, queue_time, money, kitchen time
+                       "qqqqqq?"    # arrived, turned_away, served, lost, next uid, kitchen seq, game over
+                       "d16s16sBI"  # arrival clock, PCG64 state, inc, has_uint32, uinteger
+                       "IIIII")     # bytes of settings, arrival times, customer draws, tasks, line
+TASK_DTYPE = np.dtype([("done_at", "<f8"), ("seq", "<i8"), ("dish", "<i2"), ("stove", "<i2"),
+                       ("total", "<f8")])
+CUSTOMER_DTYPE = np.dtype([("uid", "<i8"), ("order", "<i2"), ("patience", "<f8"),
+                           ("deadline", "<f8"), ("x", "<f8"), ("prev_x", "<f8")])
+
+# Fresh shifts to clone per settings JSON, so restoring never parses settings twice
+_templates = {}
+# Encoded settings per settings dict (kept alive here so its id stays unique)
+_encoded = {}
+
+
+def _settings_json(settings):
+    entry = _encoded.get(id(settings))
+    if entry is None or entry[0] is not settings:
+        if len(_encoded) > 64:
+            _encoded.clear()
+        entry = _encoded[id(settings)] = (settings, json.dumps(settings, sort_keys=True).encode("utf-8"))
+    return entry[1]
+
+
+def snapshot(shift):
+    """The shift's state as bytes, for restore() or save_snapshot()."""
+    arrivals = shift.arrivals
+    rng = arrivals.rng_state()
+    if rng["bit_generator"] != "PCG64":
+        raise ValueError(f"Can't snapshot a {rng['bit_generator']} generator")
+
+    settings = _settings_json(shift.settings)
+    times = arrivals.times[arrivals.time_index:].astype("<f8").tobytes()
+    orders = arrivals.orders[arrivals.customer_index:].astype("<i8").tobytes()
+    patience = arrivals.patience[arrivals.customer_index:].astype("<f8").tobytes()
+    counts = np.concatenate([shift.inventory.stock, shift.inventory.ready]).astype("<i8").tobytes()
+
+    kitchen = shift.kitchen
+    tasks = np.array([(done_at, seq, task["dish"], task["stove"], task["total"])
+                      for done_at, seq, task in kitchen.tasks], dtype=TASK_DTYPE).tobytes()
+    line = np.array([(c.uid, c.order, c.max_patience, c.deadline, c.x, c.prev_x)
+                     for c in shift.customers.waiting()], dtype=CUSTOMER_DTYPE).tobytes()
+
+    header = HEADER.pack(
+        MAGIC, VERSION,
+        shift.time, shift.next_arrival, shift.queue_time, shift.inventory.money, kitchen.time,
+        shift.arrived, shift.turned_away, shift.served, shift.lost_customers,
+        shift.customers.next_uid, kitchen.seq, shift.game_over,
+        arrivals.clock, rng["state"]["state"].to_bytes(16, "little"), rng["state"]["inc"].to_bytes(16, "little"),
+        rng["has_uint32"], rng["uinteger"],
+        len(settings), len(times), len(orders) // 8, len(tasks), len(line))
+    return b"".join([header, settings, times, orders, patience, counts, tasks, line])
+
+
+def restore(data):
+    """A Shift from snapshot() bytes, ready to step (Shift.log_to() to log it)."""
+    (magic, version, time, next_arrival, queue_time, money, kitchen_time,
+     arrived, turned_away, served, lost, next_uid, seq, game_over,
+     clock, state, inc, has_uint32, uinteger,
+     n_settings, n_times, n_draws, n_tasks, n_line) = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"Not a version {VERSION} shift snapshot")
+
+    offset = HEADER.size
+    settings = bytes(data[offset:offset + n_settings])
+    offset += n_settings
+    template = _templates.get(settings)
+    if template is None:
+        if len(_templates) > 64:
+            _templates.clear()
+        template = _templates[settings] = Shift(seed=0, overrides=json.loads(settings))
+    shift = template.clone()
+
+    def take(dtype, nbytes):
+        # Read-only views into data; the arrays copied below are the ones that get written to
+        nonlocal offset
+        array = np.frombuffer(data, dtype=dtype, count=nbytes // np.dtype(dtype).itemsize, offset=offset)
+        offset += nbytes
+        return array
+
+    shift.time = time
+    shift.next_arrival = next_arrival
+    shift.queue_time = queue_time
+    shift.arrived = arrived
+    shift.turned_away = turned_away
+    shift.served = served
+    shift.lost_customers = lost
+    shift.game_over = game_over
+
+    # Arrival draws are only ever replaced, never written to, so views will do
+    arrivals = shift.arrivals
+    arrivals.clock = clock
+    arrivals.times = take("<f8", n_times)
+    arrivals.time_index = 0
+    arrivals.orders = take("<i8", n_draws * 8)
+    arrivals.patience = take("<f8", n_draws * 8)
+    arrivals.customer_index = 0
+    arrivals._rng = None
+    arrivals._rng_state = {"bit_generator": "PCG64",
+                           "state": {"state": int.from_bytes(state, "little"), "inc": int.from_bytes(inc, "little")},
+                           "has_uint32": has_uint32, "uinteger": uinteger}
+
+    inventory = shift.inventory
+    # Money is an int unless float prices were set
+    inventory.money = int(money) if money.is_integer() else money
+    inventory.stock[:] = take("<i8", inventory.stock.size * 8)
+    inventory.ready[:] = take("<i8", inventory.ready.size * 8)
+
+    kitchen = shift.kitchen
+    kitchen.time = kitchen_time
+    kitchen.seq = seq
+    dishes = shift.dishes
+    for done_at, task_seq, dish, stove, total in take(TASK_DTYPE, n_tasks).tolist():
+        task = {"name": dishes[dish], "dish": dish, "stove": stove, "done_at": done_at, "total": total}
+        kitchen.tasks.append((done_at, task_seq, task))
+        kitchen.stoves[stove] = task
+        kitchen.free_stoves.remove(stove)
+        kitchen.cooking[task["name"]] += 1
+    # Tasks were saved in heap order; the free stoves need sorting out again
+    heapq.heapify(kitchen.free_stoves)
+
+    customers = shift.customers
+    for uid, order, patience, deadline, x, prev_x in take(CUSTOMER_DTYPE, n_line).tolist():
+        customer = QueuedCustomer(uid, order, patience, deadline, x)
+        customer.prev_x = prev_x
+        customers.line.append(customer)
+    # A sorted list is a valid heap
+    customers.deadlines = sorted((c.deadline, c.uid, c) for c in customers.line)
+    customers.count = len(customers.line)
+    customers.next_uid = next_uid
+    return shift
+
+
+def save_snapshot(shift, path):
+    # Written next to the old one and swapped in, so a crash mid-write leaves the last good snapshot
+    temp = path + ".tmp"
+    with open(temp, "wb") as f:
+        f.write(snapshot(shift))
+    os.replace(temp, path)
+
+
+def load_snapshot(path):
+    with open(path, "rb") as f:
+        return restore(f.read())
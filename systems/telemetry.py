@@ -0,0 +1,174 @@
+# systems/telemetry.py
+import json
+import queue
+import struct
+import threading
+
+import numpy as np
+
+# A telemetry log is one JSON header line, then fixed-size binary records:
+#   time (f8), event (u1), detail (i1), item (i2), id (i4), value (f4)
+# item is a dish or ingredient id, id a customer uid or stove index, -1 if
+# unused. What detail and value mean depends on the event:
+#   arrive        id uid, item order, value patience
+#   turned_away   line was full
+#   buy           item ingredient, value price, detail 1 if it couldn't be afforded
+#   cook          id stove, item dish, value cooking time
+#   cook_failed   item dish, detail FULL or MISSING
+#   ready         id stove, item dish (time is when it finished)
+#   serve         id uid, item dish, value time waited
+#   timeout       id uid, item order, value time waited (time is the deadline)
+#   end           the shift was closed at this time
+VERSION = 1
+EVENTS = ("arrive", "turned_away", "buy", "cook", "cook_failed", "ready", "serve", "timeout", "end")
+ARRIVE, TURNED_AWAY, BUY, COOK, COOK_FAILED, READY, SERVE, TIMEOUT, END = range(len(EVENTS))
+
+# cook_failed details
+FULL, MISSING = 1, 2
+
+RECORD = struct.Struct("<dBbhif")
+RECORD_DTYPE = np.dtype([("time", "<f8"), ("event", "u1"), ("detail", "i1"),
+                         ("item", "<i2"), ("id", "<i4"), ("value", "<f4")])
+
+
+class Telemetry:
+    """
+    Structured event log of one Shift. emit() only appends a tuple to an
+    in-memory buffer; every `chunk` events the buffer is handed to a
+    background thread that packs and writes it, so the game never waits on
+    the disk. close() writes whatever is left and stops the thread.
+    """
+
+    def __init__(self, path, chunk=4096):
+        self.path = path
+        self.chunk = chunk
+        self.buffer = []
+        self.count = 0  # Events emitted so far
+        self._jobs = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+
+    def start(self, header):
+        """Write the header (names for the ids, seed, ...). Called by the Shift."""
+        self._jobs.put(("header", {"version": VERSION, "events": EVENTS, "record": RECORD.format, **header}))
+
+    def emit(self, event, time, id=-1, item=-1, value=0.0, detail=0):
+        self.buffer.append((time, event, detail, item, id, value))
+        if len(self.buffer) >= self.chunk:
+            self.flush()
+
+    def flush(self):
+        # Hand the buffer to the writer; a new list keeps emit() lock-free
+        if self.buffer:
+            self.count += len(self.buffer)
+            self._jobs.put(("records", self.buffer))
+            self.buffer = []
+
+    def close(self, time=None):
+        """Write everything out, with an end event at time if given, and stop."""
+        if time is not None:
+            self.emit(END, time)
+        self.flush()
+        self._jobs.put(("stop", None))
+        self._writer.join()
+
+    # --- DISK (background thread) ---
+    def _write_loop(self):
+        f = None
+        try:
+            while True:
+                job, payload = self._jobs.get()
+                if job == "stop":
+                    return
+                if job == "header":
+                    f = open(self.path, "wb")
+                    f.write(json.dumps(payload).encode("utf-8") + b"\n")
+                elif job == "records" and f is not None:
+                    f.write(b"".join([RECORD.pack(*r) for r in payload]))
+        except OSError as e:
+            print("Failed to write telemetry:", e)
+        finally:
+            if f is not None:
+                f.close()
+
+
+def load_log(path):
+    """(header dict, structured array of events) from a telemetry log."""
+    with open(path, "rb") as f:
+        header = json.loads(f.readline())
+        data = f.read()
+    if header.get("version") != VERSION:
+        raise ValueError(f"{path}: unsupported telemetry version {header.get('version')}")
+    # A crash can leave half a record at the end
+    usable = len(data) - len(data) % RECORD_DTYPE.itemsize
+    return header, np.frombuffer(data[:usable], dtype=RECORD_DTYPE)
+
+
+def _percentiles(values):
+    if not len(values):
+        return None
+    p50, p90, p99 = np.percentile(values, [50, 90, 99])
+    return {"count": int(len(values)), "mean": float(values.mean()), "p50": float(p50),
+            "p90": float(p90), "p99": float(p99), "max": float(values.max())}
+
+
+def analyze(header, events):
+    """
+    Wait times, stove utilization and why customers were lost, all from
+    array operations over the event log.
+    """
+    dishes = header["dishes"]
+    kind = events["event"]
+    # A log written after --resume starts mid-shift, at resumed_at
+    start = float(header.get("resumed_at") or 0.0)
+    end = events["time"][kind == END]
+    end = float(end[-1]) if len(end) else float(events["time"][-1]) if len(events) else start
+    duration = end - start
+
+    served = events[kind == SERVE]
+    timeouts = events[kind == TIMEOUT]
+
+    # Stove utilization: each cook keeps its stove busy until it's done or the log ends
+    cooks = events[kind == COOK]
+    busy = np.minimum(cooks["time"] + cooks["value"], end) - cooks["time"]
+    stoves = header["stoves"]
+    per_stove = np.bincount(cooks["id"], weights=busy, minlength=stoves)
+    utilization = per_stove / duration if duration > 0 else np.zeros(stoves)
+
+    # Loss causes: at each walkout, was their dish ready, on a stove, or neither?
+    # Running counts per dish over the whole log, read at each timeout's index
+    index = np.flatnonzero(kind == TIMEOUT)
+    ready_now = np.zeros(len(index), dtype=np.int64)
+    cooking_now = np.zeros(len(index), dtype=np.int64)
+    for dish in range(len(dishes)):
+        mine = events["item"] == dish
+        ready = np.cumsum((mine & (kind == READY)).astype(np.int64) - (mine & (kind == SERVE)))
+        cooking = np.cumsum((mine & (kind == COOK)).astype(np.int64) - (mine & (kind == READY)))
+        wants = timeouts["item"] == dish
+        ready_now[wants] = ready[index[wants]]
+        cooking_now[wants] = cooking[index[wants]]
+    causes = {
+        "dish ready, not served": int((ready_now > 0).sum()),
+        "dish still cooking": int(((ready_now <= 0) & (cooking_now > 0)).sum()),
+        "dish never started": int(((ready_now <= 0) & (cooking_now <= 0)).sum()),
+        "turned away (line full)": int((kind == TURNED_AWAY).sum()),
+    }
+
+    failed = events[kind == COOK_FAILED]
+    return {
+        "duration": duration,
+        "events": int(len(events)),
+        "arrived": int((kind == ARRIVE).sum()),
+        "served": int(len(served)),
+        "lost": int(len(timeouts)),
+        "wait_served": _percentiles(served["value"]),
+        "wait_lost": _percentiles(timeouts["value"]),
+        "wait_by_dish": {name: _percentiles(served["value"][served["item"] == i]) for i, name in enumerate(dishes)},
+        "stove_utilization": utilization.tolist(),
+        "kitchen_utilization": float(utilization.mean()) if stoves else 0.0,
+        "loss_causes": causes,
+        "lost_by_dish": dict(zip(dishes, np.bincount(timeouts["item"], minlength=len(dishes)).tolist())),
+        "cook_failed": {"full": int((failed["detail"] == FULL).sum()),
+                        "missing": int((failed["detail"] == MISSING).sum())},
+        "purchases": int(((kind == BUY) & (events["detail"] == 0)).sum()),
+    }
@@ -0,0 +1,35 @@
+# tests/test_arrivals.py
+import math
+
+from settings import FPS
+from systems.simulation import Shift
+from systems.policies import greedy_policy
+
+CLOSING_TIME = [(0, 0.2), (30, 0.2), (60, 0.0)]
+
+
+def test_closing_profile_stops_arriving():
+    shift = Shift(seed=1, overrides={"ARRIVAL_PROFILE": CLOSING_TIME, "MAX_LOST": 10 ** 9})
+    results = shift.run_events(600, policy=greedy_policy)
+    assert 600 <= results["time"] < 600 + 1 / FPS
+    assert results["arrived"] > 0
+    assert math.isinf(shift.next_arrival)
+
+
+def test_closing_profile_frame_stepping():
+    shift = Shift(seed=2, overrides={"ARRIVAL_PROFILE": CLOSING_TIME, "MAX_LOST": 10 ** 9})
+    shift.run(120, policy=greedy_policy)
+    arrived = shift.arrived
+    shift.run(200, policy=greedy_policy)
+    assert shift.arrived == arrived
+
+
+def test_all_zero_profile():
+    shift = Shift(seed=3, overrides={"ARRIVAL_PROFILE": [(0, 0.0), (60, 0.0)]})
+    assert shift.run_events(300)["arrived"] == 0
+
+
+def test_zero_arrival_rate():
+    shift = Shift(seed=4, overrides={"ARRIVAL_RATE": 0})
+    assert shift.run_events(300)["arrived"] == 0
+    assert shift.run(310)["arrived"] == 0
@@ -0,0 +1,26 @@
+# tests/test_batch.py
+import numpy as np
+import pytest
+
+from systems.batch import BatchShift, NOOP
+from systems.policies import batch_greedy_policy
+
+
+def test_greedy_batch_plays():
+    batch = BatchShift(8, seed=0, duration=60, auto_reset=False)
+    obs = batch.observe()
+    while not batch.done.all():
+        obs, _, _ = batch.step(batch_greedy_policy(batch, obs))
+    assert batch.results()["served"].sum() > 0
+
+
+@pytest.mark.parametrize("bad", [-1, "n_actions"])
+def test_out_of_range_actions_raise(bad):
+    batch = BatchShift(4, seed=0)
+    actions = np.full(4, NOOP)
+    actions[2] = batch.n_actions if bad == "n_actions" else bad
+    with pytest.raises(ValueError):
+        batch.step(actions)
+    # Nothing moved
+    assert (batch.time == 0).all()
+    batch.step(np.full(4, batch.serve_action))
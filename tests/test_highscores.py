@@ -0,0 +1,67 @@
+# tests/test_highscores.py
+import json
+import os
+
+from systems.highscores import HighscoreStore
+
+SCORES = [("ann", 40), ("bo", 95), ("cy", 10), ("di", 70), ("ed", 95), ("fay", 55),
+          ("gus", 5), ("hal", 80), ("ivy", 60), ("jo", 20), ("kit", 85), ("lu", 30)]
+
+
+def best(entries, k=5):
+    # Best first, earlier entries win ties
+    ordered = sorted(enumerate(entries), key=lambda e: (-e[1][1], e[0]))
+    return [{"name": name, "score": score} for _, (name, score) in ordered[:k]]
+
+
+def fill(store, entries):
+    for name, score in entries:
+        store.add(name, score)
+    store.flush()
+
+
+def test_reload_from_journal_after_crash(tmp_path):
+    path = str(tmp_path / "highscores.json")
+    crashed = HighscoreStore(path, compact_every=100)
+    fill(crashed, SCORES)
+    # Never closed: nothing was compacted, everything is in the journal
+    assert not os.path.exists(path)
+
+    store = HighscoreStore(path)
+    assert store.top() == best(SCORES)
+    assert store.is_highscore(71) and not store.is_highscore(70)
+    store.close()
+
+
+def test_compact_keeps_everything(tmp_path):
+    path = str(tmp_path / "highscores.json")
+    store = HighscoreStore(path, compact_every=5)
+    fill(store, SCORES)
+    # Compacted twice; the last two entries are only in the journal
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f)["seq"] == 10
+    with open(path + ".journal", encoding="utf-8") as f:
+        assert len(f.readlines()) == 2
+    assert HighscoreStore(path).top() == best(SCORES)
+
+    store.close()
+    with open(path + ".journal", encoding="utf-8") as f:
+        assert f.read() == ""
+    reloaded = HighscoreStore(path, compact_every=5)
+    assert reloaded.top() == best(SCORES)
+
+    # New entries after a reload carry on from the snapshot's seq
+    more = [("max", 90), ("ned", 99)]
+    fill(reloaded, more)
+    assert HighscoreStore(path).top() == best(SCORES + more)
+    reloaded.close()
+    assert HighscoreStore(path).top() == best(SCORES + more)
+
+
+def test_torn_journal_line(tmp_path):
+    path = str(tmp_path / "highscores.json")
+    store = HighscoreStore(path, compact_every=100)
+    fill(store, SCORES[:4])
+    with open(path + ".journal", "a", encoding="utf-8") as f:
+        f.write('{"seq": 5, "name": "zed", "sco')
+    assert HighscoreStore(path).top() == best(SCORES[:4])
@@ -0,0 +1,70 @@
+# tests/test_kitchen.py
+import pytest
+
+from systems.inventory import Inventory
+from systems.kitchen import Kitchen
+
+TIMES = {"Fried Rice": 5, "Chicken Rice": 8, "Omelet": 3}
+
+
+@pytest.fixture
+def kitchen():
+    inventory = Inventory()
+    inventory.stock[:] = 10
+    return Kitchen(inventory, max_slots=3, cooking_times=TIMES)
+
+
+def test_start_cooking(kitchen):
+    assert kitchen.next_completion_time() is None
+    assert kitchen.start_cooking("Omelet") == (True, None)
+    assert kitchen.inventory.items["Egg"] == 8
+    assert kitchen.stoves[0]["name"] == "Omelet"
+    assert kitchen.cooking_count("Omelet") == 1
+    assert kitchen.next_completion_time() == 3
+
+
+def test_full_and_missing(kitchen):
+    for _ in range(3):
+        assert kitchen.start_cooking("Chicken Rice")[0]
+    assert kitchen.start_cooking("Omelet") == (False, "full")
+
+    empty = Kitchen(Inventory(), cooking_times=TIMES)
+    assert empty.start_cooking("Omelet") == (False, {"Egg": 2, "Veggie": 1})
+
+
+def test_advance_to_finishes_several_in_one_frame(kitchen):
+    kitchen.start_cooking("Fried Rice")    # done at 5
+    kitchen.advance_to(2)
+    kitchen.start_cooking("Omelet")        # done at 5 too
+    kitchen.start_cooking("Chicken Rice")  # done at 10
+    assert kitchen.next_completion_time() == 5
+
+    kitchen.advance_to(4.99)
+    assert kitchen.inventory.cooked_food["Fried Rice"] == 0
+
+    kitchen.advance_to(5 + 1 / 60)
+    assert kitchen.inventory.cooked_food["Fried Rice"] == 1
+    assert kitchen.inventory.cooked_food["Omelet"] == 1
+    assert kitchen.cooking_count("Omelet") == 0
+    assert kitchen.stoves == [None, None, kitchen.stoves[2]]
+    assert kitchen.next_completion_time() == 10
+
+    # Freed stoves are reused lowest first
+    kitchen.start_cooking("Omelet")
+    assert kitchen.stoves[0]["name"] == "Omelet"
+    assert kitchen.next_completion_time() == pytest.approx(5 + 1 / 60 + 3)
+
+    kitchen.advance_to(20)
+    assert kitchen.next_completion_time() is None
+    assert kitchen.stoves == [None] * 3
+    assert kitchen.free_stoves[0] == 0 and sorted(kitchen.free_stoves) == [0, 1, 2]
+
+
+def test_clone_is_independent(kitchen):
+    kitchen.start_cooking("Omelet")
+    inventory = kitchen.inventory.clone()
+    copy = kitchen.clone(inventory)
+    copy.advance_to(10)
+    assert inventory.cooked_food["Omelet"] == 1
+    assert kitchen.inventory.cooked_food["Omelet"] == 0
+    assert kitchen.next_completion_time() == 3
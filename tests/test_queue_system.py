@@ -0,0 +1,66 @@
+# tests/test_queue_system.py
+from systems.queue_system import CustomerQueue
+
+
+def uids(queue):
+    return [c.uid for c in queue.waiting()]
+
+
+def test_arrive_and_serve():
+    queue = CustomerQueue()
+    assert queue.front() is None and queue.next_deadline() is None
+    for now, order in enumerate((2, 0, 1)):
+        queue.add(order, patience=10, now=now, x=0)
+    assert len(queue) == 3
+    assert queue.orders() == [2, 0, 1]
+    assert queue.next_deadline() == 10
+
+    served = queue.serve_front()
+    assert served.uid == 0 and served.gone
+    assert queue.front().uid == 1
+    assert len(queue) == 2
+    # The served customer's deadline no longer counts
+    assert queue.next_deadline() == 11
+    assert queue.expire(10.5) == 0
+
+
+def test_expire_from_the_middle():
+    queue = CustomerQueue()
+    queue.add(0, patience=20, now=0, x=0)
+    queue.add(1, patience=5, now=0, x=0)
+    queue.add(2, patience=20, now=0, x=0)
+    assert queue.expire(4.9) == 0
+    assert queue.expire(5) == 1
+    assert uids(queue) == [0, 2]
+    assert queue.orders(limit=1) == [0]
+    assert queue.serve_front().uid == 0
+    assert queue.front().uid == 2
+    assert queue.next_deadline() == 20
+
+
+def test_next_deadline_after_rebuild():
+    queue = CustomerQueue()
+    for i in range(40):
+        # Every fourth customer is patient, the rest leave at 1 + i/100
+        queue.add(i % 3, patience=100 + i if i % 4 == 0 else 1 + i / 100, now=0, x=0)
+    assert queue.expire(2) == 30
+    # Mostly people who left: the deque was rebuilt without them
+    assert len(queue.line) == len(queue) == 10
+    assert uids(queue) == list(range(0, 40, 4))
+    assert queue.next_deadline() == 100
+    assert queue.serve_front().uid == 0
+    assert queue.next_deadline() == 104
+    assert queue.expire(104) == 1
+    assert queue.front().uid == 8
+
+
+def test_clone_keeps_only_the_waiting():
+    queue = CustomerQueue()
+    for i in range(5):
+        queue.add(i % 3, patience=3 + i, now=0, x=0)
+    queue.expire(4)
+    copy = queue.clone()
+    assert uids(copy) == uids(queue) == [2, 3, 4]
+    copy.serve_front()
+    assert uids(queue) == [2, 3, 4]
+    assert copy.add(0, 1, 0, 0).uid == queue.next_uid == 5
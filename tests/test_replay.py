@@ -0,0 +1,88 @@
+# tests/test_replay.py
+import json
+
+import numpy as np
+import pytest
+
+from settings import FPS
+from systems.simulation import Shift
+from systems.replay import Recorder, Replayer, apply_command, load_recording, recording_steps, run_replay
+
+SEED = 1234
+BUSY = {"ARRIVAL_RATE": 0.45}
+
+
+def play(dts, tick=None):
+    """Play a recorded shift like a simple player would, one dt per step."""
+    shift = Shift(seed=SEED, overrides=BUSY)
+    recorder = Recorder(SEED, BUSY, tick)
+
+    def do(command, arg=None):
+        recorder.command(command, arg, shift.time)
+        return apply_command(shift, command, arg)
+
+    for dt in dts:
+        dish = shift.front_order()
+        if dish is not None:
+            if not do("serve")[0]:
+                for ingredient, qty in shift.inventory.missing(dish).items():
+                    for _ in range(qty):
+                        do("buy", ingredient)
+                if not shift.kitchen.cooking_count(dish):
+                    do("cook", dish)
+        recorder.step(dt)
+        shift.step(dt)
+    return shift, recorder
+
+
+def test_fixed_tick_replays_exactly():
+    shift, recorder = play([1 / FPS] * 120 * FPS, tick=1 / FPS)
+    recording = recorder.to_dict()
+    assert recording["tick"] == 1 / FPS
+    assert Replayer(recording).tick == 1 / FPS
+    assert recording["dt"] == [[1 / FPS, 120 * FPS]]
+    assert shift.served > 0
+    assert run_replay(recording) == shift.results()
+
+
+def test_varying_dt_replays_exactly(tmp_path):
+    rng = np.random.default_rng(5)
+    dts = [float(dt) for dt in rng.choice([1 / 60, 1 / 30, 1 / 45], size=4000, p=[0.8, 0.1, 0.1])]
+    shift, recorder = play(dts)
+    path = str(tmp_path / "shift.replay.json")
+    recorder.save(path)
+
+    recording = load_recording(path)
+    assert recording_steps(recording) == len(dts)
+    assert len(recording["dt"]) < len(dts)
+    assert run_replay(recording) == shift.results()
+
+
+def test_version_1_recordings_still_load(tmp_path):
+    dts = [1 / 60] * 1000 + [1 / 30] * 500
+    shift, recorder = play(dts)
+    path = tmp_path / "old.replay.json"
+    path.write_text(json.dumps({**recorder.to_dict(), "version": 1, "dt": dts}), encoding="utf-8")
+
+    recording = load_recording(str(path))
+    assert recording_steps(recording) == len(dts)
+    assert run_replay(recording) == shift.results()
+
+
+def test_tick_is_enforced(tmp_path):
+    recorder = Recorder(SEED, BUSY, tick=1 / 60)
+    recorder.step(1 / 60)
+    with pytest.raises(ValueError):
+        recorder.step(1 / 30)
+
+    # A recording whose steps don't match its tick can't replay under any SIM_RATE
+    _, recorder = play([1 / 60] * 10)
+    with pytest.raises(ValueError):
+        Replayer({**recorder.to_dict(), "tick": 1 / 30})
+
+    # Recordings from before the tick was kept replay with their own dts
+    path = tmp_path / "untimed.replay.json"
+    recording = recorder.to_dict()
+    del recording["tick"]
+    path.write_text(json.dumps(recording), encoding="utf-8")
+    assert Replayer(load_recording(str(path))).tick is None
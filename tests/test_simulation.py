@@ -0,0 +1,29 @@
+# tests/test_simulation.py
+import pytest
+
+from systems.simulation import Shift
+from systems.policies import greedy_policy
+
+SEEDS = range(25)
+
+
+@pytest.mark.parametrize("rate", [0.2, 0.3, 0.45, 0.6])
+def test_run_events_matches_run(rate):
+    for seed in SEEDS:
+        stepped = Shift(seed=seed, overrides={"ARRIVAL_RATE": rate}).run(120, policy=greedy_policy)
+        events = Shift(seed=seed, overrides={"ARRIVAL_RATE": rate}).run_events(120, policy=greedy_policy)
+        assert events == stepped, f"seed {seed}"
+
+
+def test_run_events_matches_run_other_dt():
+    for seed in range(10):
+        stepped = Shift(seed=seed, overrides={"ARRIVAL_RATE": 0.45}).run(120, dt=1 / 20, policy=greedy_policy)
+        events = Shift(seed=seed, overrides={"ARRIVAL_RATE": 0.45}).run_events(120, dt=1 / 20, policy=greedy_policy)
+        assert events == stepped, f"seed {seed}"
+
+
+def test_run_events_continues_a_stepped_shift():
+    stepped = Shift(seed=7, overrides={"ARRIVAL_RATE": 0.6})
+    mixed = Shift(seed=7, overrides={"ARRIVAL_RATE": 0.6})
+    mixed.run(45, policy=greedy_policy)
+    assert mixed.run_events(90, policy=greedy_policy) == stepped.run(90, policy=greedy_policy)
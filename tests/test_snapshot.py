@@ -0,0 +1,71 @@
+# tests/test_snapshot.py
+from systems.simulation import Shift
+from systems.policies import greedy_policy
+from systems.snapshot import snapshot, restore, save_snapshot, load_snapshot
+
+BUSY = {"ARRIVAL_RATE": 0.45}
+
+
+def line(shift):
+    return [(c.uid, c.order, c.max_patience, c.deadline, c.x) for c in shift.customers.waiting()]
+
+
+def kitchen(shift):
+    return sorted((done_at, task["dish"], task["stove"]) for done_at, _, task in shift.kitchen.tasks)
+
+
+def assert_same_shift(a, b):
+    assert a.results() == b.results()
+    assert line(a) == line(b)
+    assert kitchen(a) == kitchen(b)
+    assert a.next_arrival == b.next_arrival
+    assert a.inventory.stock.tolist() == b.inventory.stock.tolist()
+    assert a.inventory.ready.tolist() == b.inventory.ready.tolist()
+
+
+def mid_shift(seed):
+    shift = Shift(seed=seed, overrides=BUSY)
+    shift.run(60, policy=greedy_policy)
+    return shift
+
+
+def test_restore_continues_the_same_shift():
+    for seed in range(5):
+        shift = mid_shift(seed)
+        restored = restore(snapshot(shift))
+        assert_same_shift(restored, shift)
+
+        shift.run(150, policy=greedy_policy)
+        restored.run(150, policy=greedy_policy)
+        assert_same_shift(restored, shift)
+
+
+def test_snapshot_file_round_trip(tmp_path):
+    shift = mid_shift(11)
+    path = str(tmp_path / "shift.snap")
+    save_snapshot(shift, path)
+    restored = load_snapshot(path)
+
+    shift.run_events(150, policy=greedy_policy)
+    restored.run_events(150, policy=greedy_policy)
+    assert_same_shift(restored, shift)
+
+
+def test_clone_plays_the_same_future():
+    shift = mid_shift(3)
+    before = shift.results()
+    copy = shift.clone()
+    copy.run(150, policy=greedy_policy)
+    assert shift.results() == before  # The original didn't move
+    shift.run(150, policy=greedy_policy)
+    assert_same_shift(copy, shift)
+
+
+def test_clone_with_seed_diverges():
+    shift = mid_shift(3)
+    forks = [shift.clone(seed) for seed in range(4)]
+    for fork in forks:
+        fork.run(150, policy=greedy_policy)
+    shift.run(150, policy=greedy_policy)
+    assert len({(fork.arrived, fork.inventory.money, fork.next_arrival) for fork in forks}) > 1
+    assert any(line(fork) != line(shift) for fork in forks)
@@ -0,0 +1,33 @@
+# tests/test_telemetry.py
+import numpy as np
+import pytest
+
+from systems.telemetry import RECORD_DTYPE, COOK, READY, END, analyze
+
+HEADER = {"dishes": ["Fried Rice", "Chicken Rice", "Omelet"], "stoves": 2}
+
+
+def log(*records):
+    # (time, event, detail, item, id, value) tuples
+    return np.array(list(records), dtype=RECORD_DTYPE)
+
+
+def test_utilization_over_whole_shift():
+    events = log((150, COOK, 0, 0, 0, 10), (160, READY, 0, 0, 0, 0), (200, END, 0, -1, -1, 0))
+    report = analyze(HEADER, events)
+    assert report["duration"] == 200
+    assert report["stove_utilization"] == pytest.approx([0.05, 0.0])
+
+
+def test_resumed_log_counts_from_resume():
+    events = log((150, COOK, 0, 0, 0, 10), (160, READY, 0, 0, 0, 0), (200, END, 0, -1, -1, 0))
+    report = analyze({**HEADER, "seed": None, "resumed_at": 100.0}, events)
+    assert report["duration"] == 100
+    assert report["stove_utilization"] == pytest.approx([0.1, 0.0])
+    assert report["kitchen_utilization"] == pytest.approx(0.05)
+
+
+def test_cook_cut_off_by_end():
+    events = log((195, COOK, 0, 2, 1, 10), (200, END, 0, -1, -1, 0))
+    report = analyze({**HEADER, "resumed_at": 100.0}, events)
+    assert report["stove_utilization"] == pytest.approx([0.0, 0.05])
@@ -0,0 +1,41 @@
+# tests/test_viewport.py
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+import pytest
+
+from ui.viewport import Viewport
+
+
+@pytest.fixture
+def display():
+    pygame.display.init()
+    yield
+    pygame.display.quit()
+
+
+def click(viewport, pos):
+    event = pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=pos)
+    return viewport.map_event(event).pos
+
+
+@pytest.mark.parametrize("window, offset", [((1000, 600), (100, 0)), ((800, 700), (0, 50))])
+def test_offset_window_maps_clicks(display, window, offset):
+    # Scale 1, but the picture is letterboxed away from the corner
+    viewport = Viewport((800, 600), window)
+    assert not viewport.scaled
+    assert viewport.rect.topleft == offset
+    assert click(viewport, (400 + offset[0], 300 + offset[1])) == (400, 300)
+
+
+def test_scaled_window_maps_clicks(display):
+    viewport = Viewport((800, 600), (1600, 1200))
+    assert click(viewport, (800, 600)) == (400, 300)
+
+
+def test_other_events_pass_through(display):
+    viewport = Viewport((800, 600), (1000, 600))
+    event = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE)
+    assert viewport.map_event(event) is event
@@ -0,0 +1,63 @@
+# ui/bars.py
+import pygame
+
+
+class BarStrip:
+    """
+    Every look a bar can have, pre-rendered once into one atlas surface:
+    a row per (color band, fill width in whole pixels). Drawing a bar is
+    then a single blit of one row, and a frame's worth of bars can go to
+    the screen in one surface.blits() call via blit_item().
+
+    With a background every row is the full width (background plus fill);
+    without one only the filled part is blitted, so whatever is underneath
+    shows through.
+    """
+
+    def __init__(self, width, height, colors, background=None):
+        self.width = width
+        self.height = height
+        rows = len(colors) * (width + 1)
+        self.atlas = pygame.Surface((max(1, width), rows * height))
+
+        self.areas = []
+        for color in colors:
+            for fill in range(width + 1):
+                y = len(self.areas) * height
+                if background is not None:
+                    self.atlas.fill(background, (0, y, width, height))
+                self.atlas.fill(color, (0, y, fill, height))
+                area_width = width if background is not None else fill
+                self.areas.append(pygame.Rect(0, y, area_width, height))
+
+        if pygame.display.get_surface() is not None:
+            self.atlas = self.atlas.convert()
+
+    def area(self, ratio, band=0):
+        # Same truncation as a Rect built from width * ratio
+        if ratio >= 1.0:
+            fill = self.width
+        elif ratio <= 0.0:
+            fill = 0
+        else:
+            fill = int(self.width * ratio)
+        return self.areas[band * (self.width + 1) + fill]
+
+    def blit_item(self, pos, ratio, band=0):
+        """(source, dest, area) for surface.blits()."""
+        return (self.atlas, pos, self.area(ratio, band))
+
+    def draw(self, surface, pos, ratio, band=0):
+        surface.blit(self.atlas, pos, self.area(ratio, band))
+
+
+_strips = {}
+
+
+def bar_strip(width, height, colors, background=None):
+    """Shared BarStrip for this size and look, built on first use."""
+    key = (width, height, tuple(colors), background)
+    strip = _strips.get(key)
+    if strip is None:
+        strip = _strips[key] = BarStrip(width, height, colors, background)
+    return strip
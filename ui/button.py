@@ -1,5 +1,6 @@
 # ui/button.py
 import pygame
+from assets import get_font, render_text
 
 class Button:
     def __init__(self, x, y, width, height, text, color, hover_color, action_func=None):
@@ -8,7 +9,7 @@ class Button:
         self.color = color
         self.hover_color = hover_color
         self.action_func = action_func # The function to run when clicked
-        self.font = pygame.font.SysFont("Arial", 14, bold=True)
+        self.font = get_font("Arial", 14, bold=True)
         self.is_hovered = False
 
     def draw(self, surface):
@@ -20,7 +21,7 @@ class Button:
         pygame.draw.rect(surface, (255, 255, 255), self.rect, 2, border_radius=5) # White border
         
         # Draw text centered
-        text_surf = self.font.render(self.text, True, (255, 255, 255))
+        text_surf = render_text(self.font, self.text, (255, 255, 255))
         text_rect = text_surf.get_rect(center=self.rect.center)
         surface.blit(text_surf, text_rect)
 
@@ -1,37 +1,69 @@
 # ui/hud.py
 import pygame
+from assets import get_font, render_text
 
 class HUD:
     def __init__(self, inventory):
         self.inventory = inventory
-        self.font = pygame.font.SysFont("Arial", 20, bold=True)
+        self.font = get_font("Arial", 20, bold=True)
         self.color = (255, 255, 255)
 
-    def draw(self, surface):
-        # 1. Draw Money (Top Left, Yellow)
-        money_text = self.font.render(f"Money: ${self.inventory.money}", True, (255, 215, 0))
-        surface.blit(money_text, (20, 20))
+    # Each panel is a list of (text, color, pos) lines
+    def stock_lines(self):
+        # 1. Money (Top Left, Yellow)
+        lines = [(f"Money: ${self.inventory.money}", (255, 215, 0), (20, 20))]
 
-        # 2. Draw Inventory List (Below Money)
+        # 2. Inventory List (Below Money)
         y_offset = 60
         for item, count in self.inventory.items.items():
-            text = self.font.render(f"{item}: {count}", True, self.color)
-            surface.blit(text, (20, y_offset))
+            lines.append((f"{item}: {count}", self.color, (20, y_offset)))
             y_offset += 30 # Move down for next line
-            
-        # 3. Draw Controls Help (Bottom Left)
-        help_text = self.font.render("Press 1: Rice($2) | 2: Egg($1) | 3: Veg($2) | 4: Chk($5)", True, (150, 150, 150))
-        surface.blit(help_text, (20, 550))
+        return lines
+
+    def static_lines(self):
+        # 3. Controls Help (Bottom Left) and the Cooked Food header (Top Right).
+        # These never change, so they can be baked into a StaticLayer
+        return [
+            ("Press 1: Rice($2) | 2: Egg($1) | 3: Veg($2) | 4: Chk($5)", (150, 150, 150), (20, 550)),
+            ("READY TO SERVE:", (0, 255, 0), (600, 20)),
+        ]
 
-        # 4. Draw Cooked Food (Top Right)
+    def ready_lines(self):
+        # 4. Cooked Food (Top Right)
         # We will draw this at x=600
-        header_text = self.font.render("READY TO SERVE:", True, (0, 255, 0))
-        surface.blit(header_text, (600, 20))
-        
+        lines = []
         y_offset = 50
-        for dish, count in self.inventory.cooked_food.items():
-            # Only draw if we have at least 1, or draw all if you prefer
-            color = (255, 255, 255) if count > 0 else (100, 100, 100)
-            text = self.font.render(f"{dish}: {count}", True, color)
-            surface.blit(text, (600, y_offset))
-            y_offset += 30
\ No newline at end of file
+        cookable = self.inventory.cookable()  # Every dish checked in one go
+        for dish_id, (dish, count) in enumerate(self.inventory.cooked_food.items()):
+            # White when ready, dim green when none are ready but we could cook one
+            if count > 0:
+                color = (255, 255, 255)
+            elif cookable[dish_id]:
+                color = (120, 180, 120)
+            else:
+                color = (100, 100, 100)
+            lines.append((f"{dish}: {count}", color, (600, y_offset)))
+            y_offset += 30
+        return lines
+
+    def draw_lines(self, surface, lines):
+        for text, color, pos in lines:
+            surface.blit(render_text(self.font, text, color), pos)
+
+    def draw(self, surface):
+        self.draw_lines(surface, self.static_lines())
+        self.draw_lines(surface, self.stock_lines())
+        self.draw_lines(surface, self.ready_lines())
+
+    def widgets(self):
+        """(name, bounds, key, draw) per changing panel, for the dirty-rect renderer."""
+        panels = []
+        for name, lines in (("hud-stock", self.stock_lines()),
+                            ("hud-ready", self.ready_lines())):
+            rects = [render_text(self.font, text, color).get_rect(topleft=pos)
+                     for text, color, pos in lines]
+            bounds = rects[0].unionall(rects[1:])
+            key = tuple(lines)
+            panels.append((name, bounds, key,
+                           lambda surface, lines=lines: self.draw_lines(surface, lines)))
+        return panels
@@ -0,0 +1,190 @@
+# ui/profiler.py
+import contextlib
+import csv
+import time
+
+import pygame
+from assets import get_font
+
+PHASES = ("events", "hover", "update", "draw", "flip")
+PHASE_COLORS = {
+    "events": (80, 160, 255),
+    "hover": (180, 120, 255),
+    "update": (255, 200, 60),
+    "draw": (80, 220, 120),
+    "flip": (255, 100, 100),
+}
+# What the game is juggling, recorded with every frame
+COUNTS = ("customers", "tasks", "pool_hits", "pool_misses", "pool_peak")
+
+
+class FrameProfiler:
+    """
+    Per-phase frame timings in a fixed-size ring buffer.
+
+    The game loop calls begin_frame(), mark(phase) after each phase and
+    end_frame(...) at the end; each mark records the time since the previous
+    one. Every row is (frame_ms, one ms value per phase, then COUNTS), where
+    frame_ms is the whole loop iteration including clock.tick() and the
+    pool columns come from CustomerPool.stats().
+    While disabled every call returns straight away.
+    """
+
+    def __init__(self, size=600, enabled=False, refresh=15):
+        self.size = size
+        self.enabled = enabled
+        self.refresh = refresh  # Overlay stats are recomputed every N frames
+        self.rows = [None] * size
+        self.count = 0          # Frames recorded so far (the ring wraps at size)
+        self.current = None
+        self.frame_start = None
+        self.last_mark = 0.0
+        self.overlay = None     # (surface, key) for the cached overlay
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        # Don't count the time spent disabled as one long frame
+        self.frame_start = None
+        self.current = None
+        self.overlay = None
+
+    # --- RECORDING ---
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self.current is not None and self.frame_start is not None:
+            self.current[0] = (now - self.frame_start) * 1000
+            self.rows[self.count % self.size] = self.current
+            self.count += 1
+        self.frame_start = now
+        self.last_mark = now
+        self.current = [0.0] * (1 + len(PHASES) + len(COUNTS))
+
+    def mark(self, phase):
+        if not self.enabled or self.current is None:
+            return
+        now = time.perf_counter()
+        self.current[1 + PHASES.index(phase)] += (now - self.last_mark) * 1000
+        self.last_mark = now
+
+    def end_frame(self, customers, tasks, pool=None):
+        if not self.enabled or self.current is None:
+            return
+        # The frame time itself is filled in by the next begin_frame()
+        pool = pool or {}
+        self.current[1 + len(PHASES):] = [customers, tasks, pool.get("hits", 0),
+                                          pool.get("misses", 0), pool.get("peak", 0)]
+
+    def samples(self):
+        """Recorded rows, oldest first."""
+        if self.count <= self.size:
+            return self.rows[:self.count]
+        start = self.count % self.size
+        return self.rows[start:] + self.rows[:start]
+
+    # --- STATS ---
+    def stats(self):
+        rows = self.samples()
+        if not rows:
+            return None
+        frames = sorted(row[0] for row in rows)
+        n = len(rows)
+        return {
+            "fps": 1000 * n / sum(frames) if sum(frames) else 0.0,
+            "p50": frames[n // 2],
+            "p99": frames[min(n - 1, int(n * 0.99))],
+            "phases": {phase: sum(row[1 + i] for row in rows) / n for i, phase in enumerate(PHASES)},
+            **dict(zip(COUNTS, rows[-1][1 + len(PHASES):])),
+        }
+
+    def dump_csv(self, path):
+        rows = self.samples()
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame", "frame_ms"] + [f"{p}_ms" for p in PHASES] + list(COUNTS))
+            first = self.count - len(rows)
+            timings = 1 + len(PHASES)
+            for i, row in enumerate(rows):
+                writer.writerow([first + i] + [round(v, 4) for v in row[:timings]] + row[timings:])
+        return len(rows)
+
+    # --- OVERLAY ---
+    def bounds(self, surface):
+        return pygame.Rect(surface.get_width() - 240, 160, 230, 170)
+
+    def widgets(self, surface, budget_ms):
+        # Only changes every `refresh` frames, so the dirty renderer mostly skips it
+        if not self.enabled:
+            return []
+        key = self.count // self.refresh
+        return [("profiler", self.bounds(surface), key, lambda s: self.draw(s, budget_ms))]
+
+    def draw(self, surface, budget_ms):
+        if not self.enabled:
+            return
+        key = self.count // self.refresh
+        if self.overlay is None or self.overlay[1] != key:
+            self.overlay = (self.build_overlay(budget_ms), key)
+        surface.blit(self.overlay[0], self.bounds(surface))
+
+    def build_overlay(self, budget_ms):
+        panel = pygame.Surface((230, 170), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 180))
+        # Plain font.render: these numbers change too often for the text cache
+        font = get_font("Arial", 14)
+        stats = self.stats()
+        if stats is None:
+            panel.blit(font.render("Profiling...", True, (255, 255, 255)), (8, 6))
+            return panel
+
+        # 1. Headline numbers
+        header = f"{stats['fps']:.0f} FPS  p50 {stats['p50']:.1f} ms  p99 {stats['p99']:.1f} ms"
+        panel.blit(font.render(header, True, (255, 255, 255)), (8, 6))
+
+        # 2. One bar per phase, full width = the whole frame budget
+        y = 28
+        for phase in PHASES:
+            ms = stats["phases"][phase]
+            panel.blit(font.render(f"{phase} {ms:.2f}", True, (200, 200, 200)), (8, y))
+            width = int(110 * min(1.0, ms / budget_ms))
+            pygame.draw.rect(panel, PHASE_COLORS[phase], (110, y + 3, max(1, width), 10))
+            y += 18
+
+        # 3. What the game is juggling right now
+        counts = f"customers {stats['customers']}  tasks {stats['tasks']}"
+        panel.blit(font.render(counts, True, (255, 255, 255)), (8, y + 4))
+        pool = f"pool hits {stats['pool_hits']}  misses {stats['pool_misses']}  peak {stats['pool_peak']}"
+        panel.blit(font.render(pool, True, (255, 255, 255)), (8, y + 22))
+        return panel
+
+
+class StartupTimer:
+    """
+    Wall time of each startup phase (imports, display, assets, ...), in the
+    order they ran, for the --startup-report breakdown.
+    """
+
+    def __init__(self):
+        self.phases = []  # (name, ms)
+
+    def add(self, name, seconds):
+        self.phases.append((name, seconds * 1000))
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def total(self):
+        return sum(ms for _, ms in self.phases)
+
+    def report(self, budget_ms=None):
+        lines = [f"{name:<12} {ms:8.1f} ms" for name, ms in self.phases]
+        lines.append(f"{'total':<12} {self.total():8.1f} ms")
+        if budget_ms is not None and self.total() > budget_ms:
+            lines.append(f"over the {budget_ms} ms startup budget")
+        return "\n".join(lines)
@@ -0,0 +1,103 @@
+# ui/renderer.py
+import pygame
+
+
+class DirtyRenderer:
+    """
+    Redraws only the parts of the screen that changed.
+
+    Every frame it is handed the widgets on screen, back to front, as
+    (name, bounds, key, draw) tuples: a stable name, the Rect the widget
+    covers, a hashable key that changes whenever its look changes, and
+    draw(surface). Widgets whose bounds or key moved since last frame (and
+    ones that appeared or vanished) mark their old and new areas dirty.
+    Each dirty area is cleared (to the background color, or copied back
+    from a prebaked background surface such as a StaticLayer) and
+    everything overlapping it is redrawn with the clip set to that area.
+    Returns the rects for display.update().
+    """
+
+    def __init__(self, background):
+        self.background = background
+        self.last = {}  # name -> (bounds, key) from the previous frame
+        self.full_redraw = True
+
+    def invalidate(self):
+        # Next render repaints the whole screen (state change, window uncovered)
+        self.full_redraw = True
+
+    def render(self, surface, widgets, background=None):
+        widgets = list(widgets)
+        dirty = []
+        seen = {}
+        for name, bounds, key, _ in widgets:
+            seen[name] = (bounds, key)
+            old = self.last.get(name)
+            if old is None:
+                dirty.append(bounds)
+            elif old != (bounds, key):
+                dirty.append(bounds)
+                if old[0] != bounds:
+                    dirty.append(old[0])
+        for name, (bounds, _) in self.last.items():
+            if name not in seen:
+                dirty.append(bounds)
+        self.last = seen
+
+        if self.full_redraw:
+            self.full_redraw = False
+            dirty = [surface.get_rect()]
+        dirty = merge_rects(dirty)
+
+        for area in dirty:
+            surface.set_clip(area)
+            if background is None:
+                surface.fill(self.background, area)
+            else:
+                surface.blit(background, area, area)
+            for _, bounds, _, draw in widgets:
+                if bounds.colliderect(area):
+                    draw(surface)
+        surface.set_clip(None)
+        return dirty
+
+
+class StaticLayer:
+    """
+    Screen content that only changes on a state change (dialog frames,
+    button bodies, stove outlines, fixed labels), baked into one surface
+    and blitted with a single call. It is rebuilt when its key or the
+    target size changes, e.g. a button hover flips or the window resizes.
+    """
+
+    def __init__(self):
+        self.surface = None
+        self.key = None
+        self.builds = 0
+
+    def refresh(self, size, key, build):
+        """Rebuild with build(surface) if needed. Returns True if it was rebuilt."""
+        if self.surface is not None and self.surface.get_size() == size and key == self.key:
+            return False
+        if self.surface is None or self.surface.get_size() != size:
+            self.surface = pygame.Surface(size).convert()
+        build(self.surface)
+        self.key = key
+        self.builds += 1
+        return True
+
+
+def merge_rects(rects):
+    # Union overlapping rects so no area is cleared and redrawn twice
+    merged = []
+    for rect in rects:
+        rect = pygame.Rect(rect)
+        i = 0
+        while i < len(merged):
+            if merged[i].colliderect(rect):
+                rect.union_ip(merged.pop(i))
+                i = 0
+            else:
+                i += 1
+        merged.append(rect)
+    return merged
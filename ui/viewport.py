@@ -0,0 +1,91 @@
+# ui/viewport.py
+import pygame
+
+
+class Viewport:
+    """
+    The game draws into `surface`, a fixed logical resolution, and present()
+    puts it in the window with a single blit or scale per frame. The window
+    can be any size: the picture keeps its aspect ratio and is centered with
+    black bars. Mouse positions are mapped back to logical coordinates with
+    to_logical() / map_event(), so hit tests never see window pixels.
+    """
+
+    def __init__(self, size, window_size=None, smooth=False):
+        self.size = size
+        self.smooth = smooth
+        self.window = pygame.display.set_mode(window_size or size, pygame.RESIZABLE)
+        self.surface = pygame.Surface(size).convert()
+        self.resize()
+
+    def resize(self):
+        """Lay the picture out for the current window size (after VIDEORESIZE)."""
+        self.window = pygame.display.get_surface()
+        window_size = self.window.get_size()
+        w, h = self.size
+        scale = min(window_size[0] / w, window_size[1] / h)
+        rect = pygame.Rect(0, 0, max(1, round(w * scale)), max(1, round(h * scale)))
+        rect.center = (window_size[0] // 2, window_size[1] // 2)
+        self.rect = rect
+        self.scale = rect.w / w
+        self.scaled = rect.size != self.size
+        # Scaling writes straight into the window's pixels, no extra copy
+        self.target = self.window.subsurface(rect) if self.scaled else None
+        self.window.fill((0, 0, 0))
+        self.full = True  # Next present() sends the whole window, bars included
+
+    def toggle_smooth(self):
+        self.smooth = not self.smooth
+        self.full = True
+
+    # --- PRESENT ---
+    def present(self, dirty_rects=None):
+        """Show the logical surface. dirty_rects (logical) limits the update, None sends everything."""
+        if self.full:
+            dirty_rects = None
+            self.full = False
+        if not self.scaled:
+            if dirty_rects is None:
+                self.window.blit(self.surface, self.rect)
+                pygame.display.flip()
+            else:
+                rects = [self.window.blit(self.surface, r.move(self.rect.topleft), r) for r in dirty_rects]
+                pygame.display.update(rects)
+            return
+
+        if self.smooth:
+            try:
+                pygame.transform.smoothscale(self.surface, self.rect.size, self.target)
+            except ValueError:
+                # smoothscale needs a 24/32-bit display
+                self.smooth = False
+        if not self.smooth:
+            pygame.transform.scale(self.surface, self.rect.size, self.target)
+        if dirty_rects is None:
+            pygame.display.flip()
+        else:
+            # Smooth scaling blends neighbours, so grow the areas a little
+            pygame.display.update([self.to_window(r).inflate(2, 2) for r in dirty_rects])
+
+    # --- COORDINATES ---
+    def to_window(self, rect):
+        x = self.rect.x + int(rect.x * self.scale)
+        y = self.rect.y + int(rect.y * self.scale)
+        return pygame.Rect(x, y, int(rect.w * self.scale) + 2, int(rect.h * self.scale) + 2)
+
+    def to_logical(self, pos):
+        """Window pixel -> logical pixel (outside the picture maps past its edges)."""
+        return (int((pos[0] - self.rect.x) / self.scale), int((pos[1] - self.rect.y) / self.scale))
+
+    def mouse_pos(self):
+        return self.to_logical(pygame.mouse.get_pos())
+
+    def map_event(self, event):
+        # Mouse events get a logical pos (even at scale 1 the picture may be
+        # offset by the bars), everything else passes through
+        if event.type in (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP):
+            attrs = dict(event.dict, pos=self.to_logical(event.pos))
+            if event.type == pygame.MOUSEMOTION:
+                attrs["rel"] = (int(event.rel[0] / self.scale), int(event.rel[1] / self.scale))
+            return pygame.event.Event(event.type, attrs)
+        return event